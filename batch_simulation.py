@@ -0,0 +1,270 @@
+# Vectorized simulation of many forager bots at once
+import numpy as np
+
+from dataclasses import dataclass
+from numpy.typing import NDArray
+from typing import List, Tuple, Optional, Union, Sequence
+
+try:
+    # Assume running from psynet
+    from .helper_classes import ForagerBot, diamond_offsets
+    from .seeding import SEEDS
+    from .map_registry import MAPS
+    from .game_parameters import (
+        MAX_MOVEMENT,
+        COLLECTION_CHANCE,
+    )
+except:
+    # If not, try normal import
+    from helper_classes import ForagerBot, diamond_offsets
+    from seeding import SEEDS
+    from map_registry import MAPS
+    from game_parameters import (
+        MAX_MOVEMENT,
+        COLLECTION_CHANCE,
+    )
+
+Pos = Tuple[int, int]  # (x, y)
+
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+_MIX_1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX_2 = np.uint64(0x94D049BB133111EB)
+
+
+def _splitmix64(z: NDArray[np.uint64]) -> NDArray[np.uint64]:
+    z = (z ^ (z >> np.uint64(30))) * _MIX_1
+    z = (z ^ (z >> np.uint64(27))) * _MIX_2
+    return z ^ (z >> np.uint64(31))
+
+
+@dataclass
+class BatchRunResult:
+    coins_collected: NDArray[np.int64]
+    tiles_visited: NDArray[np.int64]
+    turns: NDArray[np.int64]
+    final_positions: NDArray[np.int64]
+    # Visited tiles per bot as (x, y) rows, only when the trajectories are recorded
+    trajectories: Optional[List[NDArray[np.int16]]] = None
+
+
+class BatchForagerSimulation:
+    """
+    Advances many independent ForagerBot instances in lockstep.
+
+    - Bot b lives on its own copy of grids[b], shape (B, HEIGHT, WIDTH).
+    - State is kept in stacked arrays: positions (B, 2) as (x, y), turns,
+      visited tiles, collected coins and remaining coins per bot.
+    - Each turn follows ForagerBot.step: go to the closest coin within
+      ForagerBot.sight_radius (ties by (y, x)), otherwise take a random step to
+      one of the distinct adjacent tiles; the walk alternates axes and tries to
+      collect on every tile it enters.
+    - Bots stop as ForagerBot.run does: as soon as they run out of fuel, even
+      halfway through a walk, or after the turn in which they run out of coins
+      or turns.
+    - Randomness comes from a counter-based stream per bot, so a bot's
+      trajectory depends only on its own seed, not on the rest of the batch.
+    - With shared_grid=True all bots forage simultaneously on one grid, each
+      seeing the coins the others already took. When several bots collect the
+      same coin in the same move, the bot with the lowest index gets it.
+    - With record=True the visited tiles of every bot are kept in a
+      (B, max fuel + 1, 2) array.
+    """
+
+    def __init__(
+        self,
+        grids: Union[NDArray, Sequence[NDArray]],
+        starts: Sequence[Pos],
+        max_speeds: Union[int, Sequence[int]] = 1,
+        seeds: Optional[Union[int, Sequence[int]]] = None,
+        shared_grid: bool = False,
+        record: bool = False,
+    ) -> None:
+        grids = np.asarray(grids)
+        if grids.ndim == 2:
+            grids = grids[None]
+        if grids.ndim != 3:
+            raise ValueError("grids must be a stack of 2D grids")
+
+        starts = np.asarray(starts, dtype=np.int64).reshape(-1, 2)
+        n_bots = len(starts)
+        if shared_grid:
+            if len(grids) != 1:
+                raise ValueError(f"Expected a single grid to share, got {len(grids)} grids")
+            self.grid_of = np.zeros(n_bots, dtype=np.int64)
+        else:
+            if len(grids) == 1 and n_bots > 1:
+                grids = np.repeat(grids, n_bots, axis=0)
+            if len(grids) != n_bots:
+                raise ValueError(f"Expected one grid per bot, got {len(grids)} grids for {n_bots} bots")
+            self.grid_of = np.arange(n_bots, dtype=np.int64)
+
+        self.n_bots = n_bots
+        _, self.height, self.width = grids.shape
+        if np.any((starts < 0) | (starts >= (self.width, self.height))):
+            raise ValueError(f"starts out of bounds for grids (W={self.width}, H={self.height})")
+
+        self.grids = grids == 1
+        self.pos = starts.copy()
+        self.max_speeds = np.broadcast_to(np.asarray(max_speeds, dtype=np.int64), (n_bots,)).copy()
+        self.collection_chance = np.array([COLLECTION_CHANCE(int(s)) for s in self.max_speeds])
+        self.fuel_steps = np.array([MAX_MOVEMENT(int(s)) for s in self.max_speeds], dtype=np.int64)
+        self.max_turns = self.fuel_steps.copy()
+
+        self.turn = np.zeros(n_bots, dtype=np.int64)
+        self.n_visited = np.ones(n_bots, dtype=np.int64)
+        self.n_collected = np.zeros(n_bots, dtype=np.int64)
+        self._grid_coins = self.grids.sum(axis=(1, 2)).astype(np.int64)
+        self.active = self.coins_remaining > 0
+
+        self.trajectories: Optional[NDArray] = None
+        if record:
+            dtype = np.int16 if max(self.width, self.height) <= np.iinfo(np.int16).max else np.int32
+            self.trajectories = np.empty((n_bots, int(self.fuel_steps.max()) + 1, 2), dtype=dtype)
+            self.trajectories[:, 0] = starts
+
+        if seeds is None:
+            seeds = SEEDS.sequence("batch", n_bots).generate_state(n_bots, dtype=np.uint64)
+        elif np.ndim(seeds) == 0:
+            seeds = np.uint64(seeds) + np.arange(n_bots, dtype=np.uint64)
+        seeds = np.asarray(seeds, dtype=np.uint64)
+        if seeds.shape != (n_bots,):
+            raise ValueError(f"Expected one seed per bot, got {seeds.shape} for {n_bots} bots")
+        self._keys = _splitmix64(seeds)
+        self._counters = np.zeros(n_bots, dtype=np.uint64)
+
+        self._offsets = diamond_offsets(ForagerBot.sight_radius)
+
+    @classmethod
+    def from_world_paths(
+        cls,
+        paths: Sequence[str],
+        starts: Sequence[Pos],
+        max_speeds: Union[int, Sequence[int]] = 1,
+        seeds: Optional[Union[int, Sequence[int]]] = None,
+    ) -> "BatchForagerSimulation":
+        """One bot per entry of paths (e.g. drawn from WORLD_PATHS), as JSON or binary maps."""
+        worlds = {path: MAPS.get(path).grid() for path in set(paths)}
+        grids = np.stack([worlds[path] for path in paths])
+        return cls(grids, starts, max_speeds, seeds)
+
+    @property
+    def coins_remaining(self) -> NDArray[np.int64]:
+        """Coins left on the grid of each bot."""
+        return self._grid_coins[self.grid_of]
+
+    def _random(self, bots: NDArray[np.int64]) -> NDArray[np.float64]:
+        """One uniform draw in [0, 1) for each of the given bots."""
+        self._counters[bots] += np.uint64(1)
+        z = _splitmix64(self._keys[bots] + self._counters[bots] * _GOLDEN)
+        return (z >> np.uint64(11)).astype(np.float64) * 2.0 ** -53
+
+    def _next_targets(self, bots: NDArray[np.int64]) -> NDArray[np.int64]:
+        x, y = self.pos[bots, 0], self.pos[bots, 1]
+
+        # Closest coin within sight, scanning offsets in (distance, y, x) order
+        tx = x[:, None] + self._offsets[None, :, 0]
+        ty = y[:, None] + self._offsets[None, :, 1]
+        inside = (tx >= 0) & (tx < self.width) & (ty >= 0) & (ty < self.height)
+        cells = (
+            self.grid_of[bots, None] * (self.height * self.width)
+            + np.clip(ty, 0, self.height - 1) * self.width
+            + np.clip(tx, 0, self.width - 1)
+        )
+        has_coin = self.grids.reshape(-1)[cells] & inside
+        found = has_coin.any(axis=1)
+        first = has_coin.argmax(axis=1)
+        rows = np.arange(len(bots))
+        targets = np.stack([tx[rows, first], ty[rows, first]], axis=1)
+
+        # Random step among the distinct (clipped) adjacent tiles
+        wander = ~found
+        if wander.any():
+            wx, wy = x[wander], y[wander]
+            adjacent = np.stack([
+                np.stack([wx, np.clip(wy - 1, 0, self.height - 1)], axis=1),
+                np.stack([np.clip(wx + 1, 0, self.width - 1), wy], axis=1),
+                np.stack([wx, np.clip(wy + 1, 0, self.height - 1)], axis=1),
+                np.stack([np.clip(wx - 1, 0, self.width - 1), wy], axis=1),
+            ], axis=1)  # (n, 4, 2)
+            same = (adjacent[:, :, None, :] == adjacent[:, None, :, :]).all(axis=3)
+            distinct = ~np.tril(same, k=-1).any(axis=2)
+            n_distinct = distinct.sum(axis=1)
+            choice = (self._random(bots[wander]) * n_distinct).astype(np.int64)
+            pick = (np.cumsum(distinct, axis=1) == (choice + 1)[:, None]) & distinct
+            targets[wander] = adjacent[np.arange(len(wx)), pick.argmax(axis=1)]
+
+        return targets
+
+    def _collect(self, bots: NDArray[np.int64]) -> None:
+        x, y = self.pos[bots, 0], self.pos[bots, 1]
+        grid = self.grid_of[bots]
+        on_coin = self.grids[grid, y, x]
+        if not on_coin.any():
+            return
+        bots, grid, x, y = bots[on_coin], grid[on_coin], x[on_coin], y[on_coin]
+        success = self._random(bots) < self.collection_chance[bots]
+        bots, grid, x, y = bots[success], grid[success], x[success], y[success]
+        # Bots are in increasing order, so the first success on a cell is the
+        # one of the lowest-indexed bot
+        _, first = np.unique((grid * self.height + y) * self.width + x, return_index=True)
+        bots, grid, x, y = bots[first], grid[first], x[first], y[first]
+        self.grids[grid, y, x] = False
+        self.n_collected[bots] += 1
+        np.subtract.at(self._grid_coins, grid, 1)
+
+    def step(self) -> None:
+        """Execute one turn for every active bot."""
+        bots = np.flatnonzero(self.active)
+        if bots.size == 0:
+            return
+
+        targets = self._next_targets(bots)
+        start = self.pos[bots]
+        delta = targets - start
+
+        # Target is the current tile: collect in place, which costs an extra turn
+        in_place = (delta == 0).all(axis=1)
+        if in_place.any():
+            self._collect(bots[in_place])
+            self.turn[bots[in_place]] += 1
+
+        # Alternating-axis walk: starts along x when there is x distance to cover,
+        # and a move along an axis already aligned with the target stays in place.
+        a, b = np.abs(delta[:, 0]), np.abs(delta[:, 1])
+        starts_x = a > 0
+        n_moves = np.where(starts_x, np.maximum(2 * a - 1, 2 * b), np.maximum(2 * b - 1, 0))
+        sign = np.sign(delta)
+        for k in range(int(n_moves.max(initial=0))):
+            # Fuel can run out halfway through the walk
+            moving = (k < n_moves) & (self.n_visited[bots] < self.fuel_steps[bots])
+            along_x = starts_x == (k % 2 == 0)
+            walkers = bots[moving]
+            for axis, on_axis in ((0, along_x), (1, ~along_x)):
+                rows = moving & on_axis
+                pending = rows & (self.pos[bots, axis] != targets[:, axis])
+                self.pos[bots[pending], axis] += sign[pending, axis]
+            if self.trajectories is not None:
+                self.trajectories[walkers, self.n_visited[walkers]] = self.pos[walkers]
+            self.n_visited[walkers] += 1
+            self._collect(walkers)
+
+        self.turn[bots] += 1
+        self.active[bots] = (
+            (self._grid_coins[self.grid_of[bots]] > 0)
+            & (self.turn[bots] < self.max_turns[bots])
+            & (self.n_visited[bots] < self.fuel_steps[bots])
+        )
+
+    def run(self) -> BatchRunResult:
+        """Step until every bot has stopped."""
+        while self.active.any():
+            self.step()
+        return BatchRunResult(
+            coins_collected=self.n_collected.copy(),
+            tiles_visited=self.n_visited.copy(),
+            turns=self.turn.copy(),
+            final_positions=self.pos.copy(),
+            trajectories=None if self.trajectories is None else [
+                self.trajectories[b, :n].copy() for b, n in enumerate(self.n_visited.tolist())
+            ],
+        )
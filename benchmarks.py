@@ -0,0 +1,306 @@
+# Benchmarks for the simulation core (World, ForagerBot, RewardProcessing)
+#
+# Runs without psynet, a database or a browser:
+#
+#   python benchmarks.py --output bench.json
+#   python benchmarks.py --sizes 40 80 160 --densities 0.01 0.05 --compare bench.json
+#   python benchmarks.py --startup
+#
+# Every case is timed with timeit (best and median of --repeats runs) and the
+# results, together with the commit and environment, are saved as JSON so that
+# runs on different commits can be compared with --compare.
+import sys
+import os
+import json
+import time
+import timeit
+import argparse
+import platform
+import tempfile
+import subprocess
+
+import numpy as np
+
+from pathlib import Path
+from contextlib import contextmanager
+from typing import List, Dict, Tuple, Callable, Optional, Any
+
+try:
+    # Assume running from psynet
+    from .helper_classes import World, ForagerBot, RewardProcessing, batch_rewards
+    from .placement import place_foragers
+    from .game_parameters import (
+        NUM_FORAGERS,
+        MAX_MOVEMENT,
+        STARTING_SLIDERS,
+    )
+except:
+    # If not, try normal import
+    from helper_classes import World, ForagerBot, RewardProcessing, batch_rewards
+    from placement import place_foragers
+    from game_parameters import (
+        NUM_FORAGERS,
+        MAX_MOVEMENT,
+        STARTING_SLIDERS,
+    )
+
+GEARS = [1, 2, 3]
+SIZES = [40, 80, 160, 320]
+DENSITIES = [0.01, 0.025, 0.05]
+INVESTMENT = 0.5
+BATCH_TRIALS = 10000
+
+# What a psynet worker imports for the simulation core, with and without the
+# plotting libraries helper_classes used to import at module level
+STARTUP_IMPORTS = {
+    "simulation core": ["helper_classes"],
+    "core + plotting": ["helper_classes", "matplotlib.pyplot", "matplotlib.patches", "matplotlib.offsetbox", "PIL.Image"],
+}
+FORKS_PER_RUN = 20
+
+# Run in a fresh interpreter: time the imports, then fork children that exit at once
+_STARTUP_SCRIPT = """
+import os, sys, json, time, resource
+start = time.perf_counter()
+for module in sys.argv[2:]:
+    __import__(module)
+imported = time.perf_counter() - start
+forks = []
+for _ in range(int(sys.argv[1])):
+    start = time.perf_counter()
+    pid = os.fork()
+    if pid == 0:
+        os._exit(0)
+    os.waitpid(pid, 0)
+    forks.append(time.perf_counter() - start)
+print(json.dumps({
+    "import": imported,
+    "fork": min(forks),
+    "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "modules": len(sys.modules),
+}))
+"""
+
+
+@contextmanager
+def world_size(width: int, height: int):
+    """Temporarily resize every World created inside the block."""
+    previous = World.width, World.height
+    World.width, World.height = width, height
+    try:
+        yield
+    finally:
+        World.width, World.height = previous
+
+
+def random_coins(width: int, height: int, n_coins: int, seed: int = 0) -> List[Tuple[int, int]]:
+    """n_coins distinct (x, y) positions drawn uniformly from the grid."""
+    rng = np.random.default_rng(seed)
+    cells = rng.choice(width * height, size=n_coins, replace=False)
+    return [(int(cell % width), int(cell // width)) for cell in cells]
+
+
+def time_call(fn: Callable[[], Any], repeats: int) -> Dict[str, float]:
+    """Best and median seconds per call of fn over `repeats` timeit runs."""
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    per_call = [t / number for t in timer.repeat(repeat=repeats, number=number)]
+    return {
+        "best": min(per_call),
+        "median": float(np.median(per_call)),
+        "calls_per_run": number,
+    }
+
+
+def cases_for(world: World, map_path: Path, coins: List[Tuple[int, int]]) -> Dict[str, Callable[[], Any]]:
+    """Named callables to time for one world."""
+    width, height = world.width, world.height
+    start = (width // 2, height // 2)
+    positions = [start] * NUM_FORAGERS
+    cases = {
+        "World.generate_from_json": lambda: World.generate_from_json(map_path),
+        "World.generate_from_coins": lambda: World.generate_from_coins(coins),
+        "World.coordinator_view": lambda: world.coordinator_view(INVESTMENT),
+        "World.generate_terrain": lambda: world.generate_terrain(),
+    }
+    for gear in GEARS:
+        cases[f"ForagerBot.run[gear={gear}]"] = lambda gear=gear: ForagerBot(
+            world.grid.copy(), start, max_speed=gear, rng=np.random.default_rng(gear),
+        ).run(fuel_steps=MAX_MOVEMENT(gear), max_turns=MAX_MOVEMENT(gear))
+        cases[f"place_foragers[gear={gear}]"] = lambda gear=gear: place_foragers(world, NUM_FORAGERS, gear)
+        cases[f"World.reward_from_bots[gear={gear}]"] = lambda gear=gear: world.reward_from_bots(
+            positions, gear, rng=np.random.default_rng(gear),
+        )
+    return cases
+
+
+def reward_text_cases() -> Dict[str, Callable[[], Any]]:
+    """RewardProcessing does not depend on the world, so it is timed once."""
+    coins = list(range(1, NUM_FORAGERS + 1))
+    sliders = dict(STARTING_SLIDERS)
+    cases = {
+        f"RewardProcessing.get_reward_text[{trial_type}]": lambda trial_type=trial_type: RewardProcessing.get_reward_text(
+            coins, sliders, INVESTMENT, trial_type,
+        )
+        for trial_type in ["coordinator", "forager-0"]
+    }
+    trials = np.random.default_rng(0).integers(0, 100, size=(BATCH_TRIALS, NUM_FORAGERS))
+    cases[f"batch_rewards[{BATCH_TRIALS} trials]"] = lambda: batch_rewards(
+        trials, sliders["overhead"], sliders["wages"], INVESTMENT,
+    )
+    return cases
+
+
+def run_benchmarks(
+    sizes: List[int],
+    densities: List[float],
+    repeats: int,
+    only: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    results = []
+
+    def record(name: str, fn: Callable[[], Any], **params: Any) -> None:
+        if only is not None and only not in name:
+            return
+        timing = time_call(fn, repeats)
+        results.append({"name": name, **params, **timing})
+        print(f"{name:<45} {str(params):<45} best {timing['best'] * 1e3:10.3f} ms")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            for density in densities:
+                n_coins = max(1, int(density * size * size))
+                coins = random_coins(size, size, n_coins)
+                map_path = Path(tmp) / f"map_{size}_{n_coins}.json"
+                with open(map_path, "w") as map_file:
+                    json.dump(coins, map_file)
+                with world_size(size, size):
+                    world = World.generate_from_json(map_path)
+                    for name, fn in cases_for(world, map_path, coins).items():
+                        record(name, fn, size=size, n_coins=n_coins)
+
+    for name, fn in reward_text_cases().items():
+        record(name, fn)
+    return results
+
+
+def startup_costs(repeats: int) -> Dict[str, Dict[str, float]]:
+    """Cold import time, fork time and memory of a worker, per set of STARTUP_IMPORTS.
+
+    Each measurement runs in a new interpreter (best of `repeats`), so nothing
+    is cached in the process; the OS file cache is warm after the first run.
+    """
+    costs = {}
+    for label, modules in STARTUP_IMPORTS.items():
+        runs = []
+        for _ in range(repeats):
+            output = subprocess.run(
+                [sys.executable, "-c", _STARTUP_SCRIPT, str(FORKS_PER_RUN), *modules],
+                cwd=Path(__file__).parent, capture_output=True, text=True, check=True,
+                env={**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [str(Path(__file__).parent), os.environ.get("PYTHONPATH")]))},
+            ).stdout
+            runs.append(json.loads(output.splitlines()[-1]))
+        costs[label] = {key: min(run[key] for run in runs) for key in runs[0]}
+        print(
+            f"{label:<20} import {costs[label]['import'] * 1e3:8.1f} ms   fork {costs[label]['fork'] * 1e3:6.2f} ms"
+            f"   max RSS {costs[label]['max_rss_mb']:6.1f} MB   {costs[label]['modules']:.0f} modules"
+        )
+    return costs
+
+
+def scaling_exponents(results: List[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+    """Log-log slope of best time against grid cells, per benchmark and coin density.
+
+    A slope of 1 means linear in the number of cells, 0 means independent of it.
+    """
+    curves: Dict[Tuple[str, float], List[Tuple[int, float]]] = {}
+    for result in results:
+        if "size" not in result:
+            continue
+        density = round(result["n_coins"] / result["size"] ** 2, 4)
+        curves.setdefault((result["name"], density), []).append((result["size"] ** 2, result["best"]))
+
+    exponents: Dict[str, Dict[str, float]] = {}
+    for (name, density), points in sorted(curves.items()):
+        if len(points) < 2:
+            continue
+        cells, seconds = np.log(np.array(points)).T
+        slope = np.polyfit(cells, seconds, 1)[0]
+        exponents.setdefault(name, {})[str(density)] = float(slope)
+    return exponents
+
+
+def environment() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=Path(__file__).parent, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+    }
+
+
+def compare(results: List[Dict[str, Any]], baseline_path: Path) -> None:
+    """Print the ratio of each best time to the same case in a previous run."""
+    with open(baseline_path, "r") as f:
+        baseline = json.load(f)
+    key = lambda result: (result["name"], result.get("size"), result.get("n_coins"))
+    previous = {key(result): result["best"] for result in baseline["results"]}
+    print(f"\nCompared with {baseline_path} (commit {baseline['environment'].get('commit')}):")
+    for result in results:
+        before = previous.get(key(result))
+        if before is None:
+            continue
+        ratio = result["best"] / before
+        flag = "  <-- slower" if ratio > 1.2 else ""
+        print(f"{result['name']:<45} size={result.get('size')} coins={result.get('n_coins')}: {ratio:6.2f}x{flag}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmarks for the simulation core")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="Grid sides to sweep")
+    parser.add_argument("--densities", type=float, nargs="+", default=DENSITIES, help="Coins per cell to sweep")
+    parser.add_argument("--repeats", type=int, default=5, help="timeit runs per case")
+    parser.add_argument("--only", type=str, default=None, help="Only run cases whose name contains this")
+    parser.add_argument("--output", type=Path, default=None, help="Where to save the results as JSON")
+    parser.add_argument("--compare", type=Path, default=None, help="Previous JSON results to compare against")
+    parser.add_argument("--startup", action="store_true", help="Only measure worker import and fork costs")
+    args = parser.parse_args()
+
+    if args.startup:
+        costs = startup_costs(args.repeats)
+        if args.output is not None:
+            with open(args.output, "w") as f:
+                json.dump({"environment": environment(), "startup": costs}, f, indent=2)
+            print(f"\nSaved results to {args.output}")
+        return
+
+    results = run_benchmarks(args.sizes, args.densities, args.repeats, args.only)
+    exponents = scaling_exponents(results)
+    print("\nScaling exponent of time against grid cells (per coin density):")
+    for name, slopes in exponents.items():
+        print(f"{name:<45} " + "  ".join(f"{density}: {slope:5.2f}" for density, slope in slopes.items()))
+
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            json.dump({
+                "environment": environment(),
+                "parameters": {"sizes": args.sizes, "densities": args.densities, "repeats": args.repeats},
+                "results": results,
+                "scaling": exponents,
+            }, f, indent=2)
+        print(f"\nSaved results to {args.output}")
+    if args.compare is not None:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
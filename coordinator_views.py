@@ -0,0 +1,163 @@
+# Module with the cache of precomputed coordinator views
+import os
+import threading
+import numpy as np
+
+from pathlib import Path
+from collections import OrderedDict
+from numpy.typing import NDArray
+from typing import Tuple, Iterable, Union
+
+try:
+    # Assume running from psynet
+    from .helper_classes import World
+    from .map_registry import MAPS
+    from .seeding import SEEDS
+    from .game_parameters import (
+        WORLD_PATHS,
+        COORDINATOR_INITIAL_ENDOWMENT,
+        COORDINATOR_VIEW_SEEDS,
+    )
+except:
+    # If not, try normal import
+    from helper_classes import World
+    from map_registry import MAPS
+    from seeding import SEEDS
+    from game_parameters import (
+        WORLD_PATHS,
+        COORDINATOR_INITIAL_ENDOWMENT,
+        COORDINATOR_VIEW_SEEDS,
+    )
+
+
+def view_parameters() -> Tuple[float, float, float, float]:
+    """The World parameters a coordinator view depends on besides the coins."""
+    return World.threshold, World.steepness, World.min_value, World.proportion
+
+
+def view_seed(participant_id: int) -> int:
+    """Seed of the views shown to a participant, one of range(COORDINATOR_VIEW_SEEDS)."""
+    return participant_id % COORDINATOR_VIEW_SEEDS
+
+
+class CoordinatorViewCache:
+    """
+    Coordinator views (see World.coordinator_view) per map, investment step and seed.
+
+    - Investment is chosen on a slider with n_steps steps, so each map only has
+      n_steps + 1 possible views per seed; precompute() builds them all ahead
+      of time and get() then only looks them up.
+    - Each view is drawn from its own stream, SEEDS.rng("coordinator_view", ...),
+      so a view does not depend on which views were computed before it.
+    - Seeds come from view_seed(participant.id), so coordinators do not all see
+      the same draw; precompute() builds every seed by default.
+    - Nothing is built at import. The experiment calls precompute() as each
+      server worker starts, before it serves a page; any other view is
+      computed on its first get() in the process.
+    - Views are returned read-only and shared, never copied.
+    - Entries are keyed by the map's content digest, so views of an edited map
+      are never served again and age out of the cache.
+    - Changing a view parameter on World (threshold, steepness, min_value or
+      proportion) drops every view on the next lookup; invalidate() does it
+      explicitly.
+    - At most max_bytes of views are kept, least recently used evicted first.
+    """
+
+    def __init__(self, max_bytes: int = 32 * 2 ** 20) -> None:
+        self.max_bytes = max_bytes
+        self._views: "OrderedDict[tuple, NDArray[np.uint8]]" = OrderedDict()
+        self._parameters = view_parameters()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(
+        self,
+        map_path: Union[str, Path],
+        investment: float,
+        seed: int = 0,
+        n_steps: int = COORDINATOR_INITIAL_ENDOWMENT,
+    ) -> NDArray[np.uint8]:
+        """View of the map for an investment in [0, 1], computed now if it is not cached.
+
+        Investments off the slider grid (not a multiple of 1 / n_steps) are
+        computed every time and not stored.
+        """
+        step = round(investment * n_steps)
+        if not np.isclose(step / n_steps, investment):
+            return self._compute(map_path, investment, ("off_grid", investment, seed))
+        key = self._key(map_path, step, n_steps, seed)
+        with self._lock:
+            view = self._views.get(key)
+            if view is not None:
+                self._views.move_to_end(key)
+                self.hits += 1
+                return view
+        self.misses += 1
+        view = self._compute(map_path, step / n_steps, (step, n_steps, seed))
+        self._store(key, view)
+        return view
+
+    def precompute(
+        self,
+        map_paths: Iterable[Union[str, Path]] = WORLD_PATHS,
+        n_steps: int = COORDINATOR_INITIAL_ENDOWMENT,
+        seeds: Iterable[int] = range(COORDINATOR_VIEW_SEEDS),
+    ) -> int:
+        """Build every view for the given maps, slider steps and seeds; returns how many were built."""
+        built = 0
+        for map_path in map_paths:
+            world = World.generate_from_json(map_path)
+            for seed in seeds:
+                for step in range(n_steps + 1):
+                    key = self._key(map_path, step, n_steps, seed)
+                    if key in self._views:
+                        continue
+                    world._rng = SEEDS.rng("coordinator_view", os.path.normpath(map_path), step, n_steps, seed)
+                    self._store(key, self._freeze(world.coordinator_view(step / n_steps)))
+                    built += 1
+        return built
+
+    def invalidate(self) -> None:
+        """Drop every view, e.g. after changing the view parameters on World."""
+        with self._lock:
+            self._views.clear()
+            self._nbytes = 0
+            self._parameters = view_parameters()
+
+    def __len__(self) -> int:
+        return len(self._views)
+
+    @property
+    def nbytes(self) -> int:
+        return self._nbytes
+
+    def _key(self, map_path: Union[str, Path], step: int, n_steps: int, seed: int) -> tuple:
+        parameters = view_parameters()
+        if parameters != self._parameters:
+            self.invalidate()
+        return MAPS.get(map_path).digest, os.path.normpath(map_path), step, n_steps, seed, parameters
+
+    def _compute(self, map_path: Union[str, Path], investment: float, stream: tuple) -> NDArray[np.uint8]:
+        world = World.generate_from_json(map_path)
+        world._rng = SEEDS.rng("coordinator_view", os.path.normpath(map_path), *stream)
+        return self._freeze(world.coordinator_view(investment))
+
+    @staticmethod
+    def _freeze(view: NDArray[np.uint8]) -> NDArray[np.uint8]:
+        view.flags.writeable = False
+        return view
+
+    def _store(self, key: tuple, view: NDArray[np.uint8]) -> None:
+        with self._lock:
+            if key in self._views:
+                return
+            self._views[key] = view
+            self._nbytes += view.nbytes
+            while len(self._views) > 1 and self._nbytes > self.max_bytes:
+                _, evicted = self._views.popitem(last=False)
+                self._nbytes -= evicted.nbytes
+
+
+COORDINATOR_VIEWS = CoordinatorViewCache()
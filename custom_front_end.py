@@ -5,7 +5,9 @@
 ##########################################################################################
 import json
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+import numpy as np
+from numpy.typing import NDArray
+from typing import Dict, List, Tuple, Optional, Union
 
 from psynet.modular_page import Control
 from psynet.timeline import Event
@@ -19,6 +21,7 @@ from .game_parameters import (
     WORLD_HEIGHT,
     COLLECTION_CHANCE,
 )
+from .grid_encoding import encode_grid
 
 logger = get_logger()
 Pos = Tuple[int, int]  # (x, y)
@@ -82,7 +85,7 @@ class ManagerHeatmapPlacementControl(Control):
         self,
         W: int,
         H: int,
-        arr: List[List[int]],
+        arr: Union[List[List[int]], NDArray[np.uint8]],
         endowment: int,
         investment: int,
         num_foragers: int,
@@ -91,7 +94,8 @@ class ManagerHeatmapPlacementControl(Control):
         super().__init__()
         self.W = W
         self.H = H
-        self.arr = arr
+        # Indexed arr[x][y] in the template, sent compactly (see grid_encoding)
+        self.arr = encode_grid(arr)
         self.endowment = endowment
         self.investment = investment
         self.num_foragers = num_foragers
@@ -15,6 +15,8 @@ from psynet.utils import get_logger
 from .helper_classes import (
     World,
 )
+from .coordinator_views import COORDINATOR_VIEWS, view_seed
+from .grid_encoding import encode_terrain
 from .game_parameters import (
     NUM_FORAGERS,
     COORDINATOR_INITIAL_ENDOWMENT,
@@ -137,6 +139,7 @@ class PositioningControl(Control):
         world_path:str,
         context:Dict[str, Path],
         investment:float,
+        participant_id:int = 0,
     ) -> None:
         super().__init__()
         # Create world
@@ -146,7 +149,7 @@ class PositioningControl(Control):
         assert investment is not None
         # Generate attributes
         logger.info(f"Trying rgb generation...")
-        self.map = self.world.coordinator_view(investment)
+        self.map = COORDINATOR_VIEWS.get(world_path, investment, view_seed(participant_id)).tolist()
         logger.info(f"Generated!")
         self.forager_url = context["forager_url"]
         self.map_url = self.world.map_path
@@ -184,7 +187,7 @@ class CollectingControl(Control):
         self.world_w = WORLD_WIDTH
         self.world_h = WORLD_HEIGHT
         world = World.generate_from_json(Path(world_path))
-        self.map = world.grid.tolist()
+        self.map = world.grid.astype(int).tolist()
 
 
 class InvestmentControl(Control):
@@ -232,7 +235,8 @@ class ForagingControl(Control):
         logger.info("Attempting to generate world...")
         world = World.generate_from_coins(coins)
         # logger.info(f"Coins in world: {self.world.coin_positions()}")
-        self.map = world.generate_terrain()
+        # Only the coins and the seed of the terrain noise are sent (see grid_encoding)
+        self.map = encode_terrain(world.grid, world.terrain_seed())
         logger.info(f"Generated!")
         self.forager_url = context["forager_url"]
         self.coin_collected_url = context["coin_collected_url"]
@@ -8,10 +8,8 @@ from psynet.trial import ChainNode
 from psynet.utils import get_logger
 from psynet.trial.create_and_rate import CreateAndRateNodeMixin
 
-from .game_parameters import (
-    POWER_ROLES,
-    RNG,
-)
+from .game_parameters import POWER_ROLES
+from .seeding import SEEDS
 
 logger = get_logger()
 
@@ -41,7 +39,7 @@ class CustomNode(CreateAndRateNodeMixin, ChainNode):
         elif power_role == "forager":
             forager_trials = self.get_foragers(trials)
             overheads = [trial.vars["overhead"] for trial in forager_trials]
-            forager_id = RNG.choice(len(forager_trials))
+            forager_id = SEEDS.rng("power_forager", self.id).choice(len(forager_trials))
             overhead = overheads[forager_id]
             self.vars["power_forager_id"] = forager_id
             logger.info(f"Power was given to forager {forager_id}")
@@ -2,7 +2,6 @@
 ##########################################################################################
 # Imports
 ##########################################################################################
-import json
 
 from pathlib import Path
 from markupsafe import Markup
@@ -40,15 +39,21 @@ from .game_parameters import (
     ASSETS_PATHS,
     MAX_NODES_PER_CHAIN,
     NUMBER_OF_TRIALS,
-    RNG,
     WORLD_WIDTH,
     WORLD_HEIGHT,
     NUM_ROUNDS,
     COLLECTION_CHANCE,
     FUEL_PER_MOVE,
+    WORLD_PATHS,
+    PRECOMPUTE_COORDINATOR_VIEWS,
 )
 from .variable_handler import VariableHandler
 from .helper_classes import World
+from .seeding import SEEDS
+from .map_registry import MAPS
+from .coordinator_views import COORDINATOR_VIEWS
+from .grid_encoding import encode_terrain
+from .placement import PLACEMENTS
 
 logger = get_logger()
 variable_handler = VariableHandler()
@@ -91,6 +96,9 @@ class CustomControl(Control):
     def __init__(self):
         super().__init__()
         self.test = "This is a new test"
+        # Size of the map, to send placed foragers as map cells (map_x, map_y)
+        self.W = WORLD_WIDTH
+        self.H = WORLD_HEIGHT
 
 
 class ForagingControl(Control):
@@ -114,7 +122,8 @@ class ForagingControl(Control):
         logger.info("Attempting to generate world...")
         world = World.generate_from_coins(coins)
         # logger.info(f"Coins in world: {self.world.coin_positions()}")
-        self.map = world.generate_terrain()
+        # Only the coins and the seed of the terrain noise are sent (see grid_encoding)
+        self.map = encode_terrain(world.grid, world.terrain_seed())
         logger.info(f"Generated!")
         self.forager_url = context["forager_url"]
         self.coin_collected_url = context["coin_collected_url"]
@@ -149,7 +158,10 @@ class CustomPage(ModularPage):
         time_estimate:int,
         timeout: int=10,
         timeout_answer: str='No answer',
+        map_path: Union[str, Path] = WORLD_PATHS[0],
     ) -> None:
+        # Unplaced foragers are put where the placement solver would put them
+        self.map_path = map_path
 
         # Initialize the modular page
         super().__init__(
@@ -169,17 +181,23 @@ class CustomPage(ModularPage):
         logger.info(f"Page Raw answer: {raw_answer}")
 
         raw_positions = raw_answer['placements']
+        placed_positions = [
+            (dict_position['map_x'], dict_position['map_y'])
+            for dict_position in raw_positions if dict_position['placed']
+        ]
+        unplaced = len(raw_positions) - len(placed_positions)
+        # Unplaced foragers go where they add most to the placed ones
+        proposals = iter([])
+        if unplaced > 0:
+            proposals = iter(PLACEMENTS.get(self.map_path, unplaced, fixed=placed_positions).position_list())
         positions = dict()
         for dict_position in raw_positions:
             placed = dict_position['placed']
             forager_id = dict_position['id'][-1]
             if placed:
-                positions[forager_id] = (dict_position['x'], dict_position['y'])
+                positions[forager_id] = (dict_position['map_x'], dict_position['map_y'])
             else:
-                positions[forager_id] = (
-                    RNG.integers(0, WORLD_WIDTH, 1),
-                    RNG.integers(0, WORLD_HEIGHT, 1)
-                )  # <= modify depending on expected performance
+                positions[forager_id] = next(proposals)
 
         logger.info(f"Positions: {positions}")
         return positions
@@ -234,6 +252,11 @@ class CoordinatorTrial(CreateTrialMixin, ImitationChainTrial):
             )
         ])
 
+    @property
+    def map_path(self):
+        # The map of the chain (see START_NODES)
+        return self.definition.get("map_path", WORLD_PATHS[0])
+
     def get_rounds(self):
         # ---------------------------------------
         # LIST OF ROUNDS
@@ -246,6 +269,7 @@ class CoordinatorTrial(CreateTrialMixin, ImitationChainTrial):
                 CustomPage(
                     label=f"positions-{i}",
                     time_estimate=20,
+                    map_path=self.map_path,
                 ),
                 CodeBlock(
                     lambda participant: logger.info(f"Answer accumulators: {participant.answer_accumulators}"),
@@ -279,8 +303,10 @@ class ForagerTrial(RateTrialMixin, ImitationChainTrial):
     time_estimate = 320
     accumulate_answers = True
 
-    with open("./static/map0.json") as f:
-        coins = json.load(f)
+    @property
+    def coins(self):
+        # Same map as the coordinator of the chain (see START_NODES)
+        return MAPS.get(self.node.definition.get("map_path", WORLD_PATHS[0])).coins
 
     def show_trial(self, experiment, participant):
         return join([
@@ -324,6 +350,7 @@ START_NODES = [
         context=ASSETS_PATHS,
         seed={
             "commission": 0.5,
+            "map_path": WORLD_PATHS[0],
         },
         participant_group="forager"
     )
@@ -372,11 +399,18 @@ class Exp(psynet.experiment.Experiment):
         CodeBlock(
             lambda participant: participant.var.set(
                 "participant_group",
-                RNG.choice(POWER_ROLES),
+                SEEDS.rng("participant_group", participant.id).choice(POWER_ROLES),
             )
         ),
         # Start the game with trial maker
         get_trial_maker()
     )
 
+    @staticmethod
+    def gunicorn_post_worker_init(worker):
+        psynet.experiment.Experiment.gunicorn_post_worker_init(worker)
+        # Views are cached per process, so each worker builds them before its first page
+        if PRECOMPUTE_COORDINATOR_VIEWS:
+            COORDINATOR_VIEWS.precompute(WORLD_PATHS)
+
 
@@ -19,8 +19,8 @@ from .game_parameters import (
     ASSETS_PATHS,
     MAX_NODES_PER_CHAIN,
     NUMBER_OF_TRIALS,
-    RNG,
 )
+from .seeding import SEEDS
 
 logger = get_logger()
 
@@ -83,7 +83,7 @@ class Exp(psynet.experiment.Experiment):
         CodeBlock(
             lambda participant: participant.var.set(
                 "participant_group",
-                RNG.choice(POWER_ROLES),
+                SEEDS.rng("participant_group", participant.id).choice(POWER_ROLES),
             )
         ),
         # Start the game with trial maker
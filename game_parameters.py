@@ -1,5 +1,4 @@
 # Module with the game parameters
-import numpy as np
 
 NUM_FORAGERS = 2
 NUM_ROUNDS = 1
@@ -49,6 +48,12 @@ WORLD_PATHS = [
 ]
 # ----------------------------------------------
 
+# Build every coordinator view when a server worker starts (see Exp.gunicorn_post_worker_init)
+PRECOMPUTE_COORDINATOR_VIEWS = "coordinator" in POWER_ROLES
+
+# Each coordinator sees one of this many draws of a view, picked by participant id (see coordinator_views)
+COORDINATOR_VIEW_SEEDS = 4
+
 FUEL_PER_MOVE = 1
 MAX_STEPS = int(100 / FUEL_PER_MOVE)
 MAX_MOVEMENT = lambda reach: int(reach * MAX_STEPS)
@@ -88,7 +93,8 @@ ASSETS_PATHS = {
     "common_pool_url": "static/common_pool.json",
 }
 
-RNG = np.random.default_rng(42)
+# Root of every random stream, see seeding.SeedStreams
+ROOT_SEED = 42
 ACTIVATE_COMMON_POOL_LEARNING = False
 
 TOTAL_DURATION = 15
@@ -0,0 +1,125 @@
+# Module with the compact encoding of grids sent to the front end
+import base64
+import numpy as np
+
+from numpy.typing import NDArray
+from typing import Dict, Any
+
+# Codecs understood by decodeGrid in the templates:
+# - "raw": the cells as bytes, row by row
+# - "rle": (count, value) byte pairs, runs longer than 255 split in several pairs
+# - "seeded": terrain rebuilt from a seed and the coins (foraging-control.html only)
+GRID_CODECS = ("raw", "rle")
+_MAX_RUN = 255
+
+# Background noise of the foraging terrain takes values in [TERRAIN_LOW, TERRAIN_HIGH)
+TERRAIN_LOW = 220
+TERRAIN_HIGH = 255
+
+
+def lowbias32(x: NDArray[np.uint32]) -> NDArray[np.uint32]:
+    """32-bit integer hash (lowbias32), mirrored by lowbias32 in foraging-control.html."""
+    x = np.asarray(x, dtype=np.uint32)
+    # Multiplications wrap around modulo 2 ** 32 on purpose
+    with np.errstate(over="ignore"):
+        x = x ^ (x >> np.uint32(16))
+        x = x * np.uint32(0x7FEB352D)
+        x = x ^ (x >> np.uint32(15))
+        x = x * np.uint32(0x846CA68B)
+        return x ^ (x >> np.uint32(16))
+
+
+def terrain_noise(seed: int, height: int, width: int) -> NDArray[np.uint8]:
+    """
+    Cosmetic terrain noise, identical to what the browser rebuilds from the seed.
+    Cell i (row-major) gets TERRAIN_LOW + lowbias32(i ^ lowbias32(seed)) % span.
+    """
+    key = lowbias32(np.uint32(seed % 2 ** 32))
+    cells = np.arange(height * width, dtype=np.uint32)
+    noise = lowbias32(cells ^ key) % np.uint32(TERRAIN_HIGH - TERRAIN_LOW) + np.uint32(TERRAIN_LOW)
+    return noise.astype(np.uint8).reshape(height, width)
+
+
+def _run_length(cells: NDArray[np.uint8]) -> bytes:
+    """(count, value) byte pairs covering cells in order."""
+    if cells.size == 0:
+        return b""
+    starts = np.flatnonzero(np.diff(cells)) + 1
+    starts = np.concatenate([[0], starts])
+    lengths = np.diff(np.concatenate([starts, [cells.size]]))
+    # Split long runs into chunks of _MAX_RUN plus a remainder
+    chunks = (lengths + _MAX_RUN - 1) // _MAX_RUN
+    counts = np.full(chunks.sum(), _MAX_RUN, dtype=np.int64)
+    counts[np.cumsum(chunks) - 1] = lengths - _MAX_RUN * (chunks - 1)
+    pairs = np.empty((counts.size, 2), dtype=np.uint8)
+    pairs[:, 0] = counts
+    pairs[:, 1] = np.repeat(cells[starts], chunks)
+    return pairs.tobytes()
+
+
+def encode_grid(grid: Any, codec: str = "auto") -> Dict[str, Any]:
+    """
+    JSON-ready payload for a 2D grid of values in [0, 255].
+
+    - The payload is {"codec", "rows", "cols", "data"}, with data in base64.
+    - codec="auto" picks whichever of "raw" and "rle" is smaller: sparse
+      grids such as coordinator views shrink to a few hundred bytes, noisy
+      terrain stays at one byte per cell.
+    - Decoded in the templates by decodeGrid, which gives rows that are views
+      into one Uint8Array, so grid[row][col] reads and writes still work.
+    """
+    assert codec == "auto" or codec in GRID_CODECS, f"Error: codec should be 'auto' or one of {GRID_CODECS}, but got {codec}"
+    grid = np.asarray(grid)
+    if grid.ndim != 2:
+        raise ValueError("grid must be 2D")
+    if grid.size and (grid.min() < 0 or grid.max() > 255):
+        raise ValueError("grid values must be in [0, 255]")
+    cells = grid.astype(np.uint8).ravel()
+
+    encoded = {}
+    if codec in ("auto", "raw"):
+        encoded["raw"] = cells.tobytes()
+    if codec in ("auto", "rle"):
+        encoded["rle"] = _run_length(cells)
+    codec = min(encoded, key=lambda name: len(encoded[name]))
+    return {
+        "codec": codec,
+        "rows": int(grid.shape[0]),
+        "cols": int(grid.shape[1]),
+        "data": base64.b64encode(encoded[codec]).decode("ascii"),
+    }
+
+
+def encode_terrain(grid: NDArray, seed: int) -> Dict[str, Any]:
+    """
+    Payload for the foraging terrain of a 0/1 coin grid: the seed of its
+    noise and the coins as little-endian int16 (x, y) pairs, so its size grows
+    with the number of coins rather than with the grid.
+    """
+    if grid.ndim != 2:
+        raise ValueError("grid must be 2D")
+    ys, xs = np.nonzero(grid == 1)
+    coins = np.stack([xs, ys], axis=1).astype("<i2")
+    return {
+        "codec": "seeded",
+        "rows": int(grid.shape[0]),
+        "cols": int(grid.shape[1]),
+        "seed": int(seed) % 2 ** 32,
+        "data": base64.b64encode(coins.tobytes()).decode("ascii"),
+    }
+
+
+def decode_grid(payload: Dict[str, Any]) -> NDArray[np.uint8]:
+    """Inverse of encode_grid and encode_terrain."""
+    data = np.frombuffer(base64.b64decode(payload["data"]), dtype=np.uint8)
+    if payload["codec"] == "seeded":
+        terrain = terrain_noise(payload["seed"], payload["rows"], payload["cols"])
+        coins = data.view("<i2").reshape(-1, 2)
+        terrain[coins[:, 1], coins[:, 0]] = 0
+        return terrain
+    if payload["codec"] == "rle":
+        pairs = data.reshape(-1, 2)
+        data = np.repeat(pairs[:, 1], pairs[:, 0])
+    elif payload["codec"] != "raw":
+        raise ValueError(f"Unknown grid codec {payload['codec']}")
+    return data.reshape(payload["rows"], payload["cols"])
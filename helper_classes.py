@@ -1,28 +1,29 @@
 # Helper classes to be used in the experiment
-import PIL
 import json
+import os
+import threading
 
-import matplotlib
 import numpy as np
-import matplotlib.pyplot as plt
 
 from pathlib import Path
-from matplotlib.patches import Circle
 from dataclasses import dataclass
+from functools import lru_cache
+from statistics import NormalDist
+from concurrent.futures import ProcessPoolExecutor
 
 from numpy.typing import NDArray
-from matplotlib.offsetbox import (
-    AnnotationBbox,
-    OffsetImage
-)
 from typing import (
     List, Tuple, Dict, Iterable,
     Optional, Union, Any
 )
 
-from psynet.utils import get_logger
-
-logger = get_logger()
+try:
+    from psynet.utils import get_logger
+    logger = get_logger()
+except ImportError:
+    # The simulation core also runs without psynet (e.g. benchmarks.py)
+    import logging
+    logger = logging.getLogger(__name__)
 Pos = Tuple[int, int]  # (x, y)
 Number = Union[int, float]
 
@@ -30,6 +31,9 @@ Number = Union[int, float]
 try:
     # Assume running from psynet
     from .text_variables import STYLE
+    from .seeding import SEEDS, stable_key
+    from .map_registry import MAPS
+    from .grid_encoding import terrain_noise
     from .game_parameters import (
         WORLD_WIDTH,
         WORLD_HEIGHT,
@@ -39,7 +43,6 @@ try:
         NUM_FORAGERS,
         INITIAL_WEALTH,
         COORDINATOR_INITIAL_ENDOWMENT,
-        RNG,
         ASSETS_PATHS,
         MAX_MOVEMENT,
         COLLECTION_CHANCE,
@@ -47,6 +50,9 @@ try:
 except:
     # If not, try normal import
     from text_variables import STYLE
+    from seeding import SEEDS, stable_key
+    from map_registry import MAPS
+    from grid_encoding import terrain_noise
     from game_parameters import (
         WORLD_WIDTH,
         WORLD_HEIGHT,
@@ -56,7 +62,6 @@ except:
         NUM_FORAGERS,
         INITIAL_WEALTH,
         COORDINATOR_INITIAL_ENDOWMENT,
-        RNG,
         ASSETS_PATHS,
         MAX_MOVEMENT,
         COLLECTION_CHANCE,
@@ -71,6 +76,13 @@ def in_bounds(x: int, y: int, width: int, height: int) -> bool:
     return 0 <= x < width and 0 <= y < height
 
 
+def as_coords(coords: Union[Iterable[Pos], NDArray]) -> NDArray[np.int64]:
+    """(n, 2) int64 array of (x, y) from an array or a list of (x, y) pairs."""
+    if isinstance(coords, np.ndarray):
+        return coords.astype(np.int64, copy=False).reshape(-1, 2)
+    return np.array(list(coords), dtype=np.int64).reshape(-1, 2)
+
+
 def find_coins(grid: np.ndarray) -> np.ndarray:
     """Return coin coordinates as (x, y) pairs, shape (n, 2)."""
     if grid.ndim != 2:
@@ -94,6 +106,418 @@ def closest_coin(pos: Pos, coins_xy: np.ndarray) -> Optional[Pos]:
     return int(best[0]), int(best[1])
 
 
+class CoinIndex:
+    """
+    Bucketed spatial index over the coins of a 0/1 grid.
+
+    - Coins are stored as (x, y) in square buckets of side `bucket_size`.
+    - Removing a coin is O(1); the live count is kept alongside.
+    - Nearest-coin queries scan buckets in rings around the query cell and stop as
+      soon as no unvisited bucket can hold a closer coin, so their cost depends on
+      the local coin density rather than on W*H.
+    - Ties: deterministic by (y, x), as in `closest_coin`.
+    """
+
+    def __init__(self, grid: np.ndarray, bucket_size: int = 8) -> None:
+        if grid.ndim != 2:
+            raise ValueError("grid must be 2D")
+        if bucket_size <= 0:
+            raise ValueError("bucket_size must be positive")
+
+        self.height, self.width = grid.shape
+        self.bucket_size = bucket_size
+        self.n_buckets_x = -(-self.width // bucket_size)
+        self.n_buckets_y = -(-self.height // bucket_size)
+        self._buckets: Dict[Tuple[int, int], set] = {}
+        self.count = 0
+        for x, y in find_coins(grid).tolist():
+            self._buckets.setdefault(self._bucket_of(x, y), set()).add((x, y))
+            self.count += 1
+
+    def _bucket_of(self, x: int, y: int) -> Tuple[int, int]:
+        return x // self.bucket_size, y // self.bucket_size
+
+    def __contains__(self, pos: Pos) -> bool:
+        bucket = self._buckets.get(self._bucket_of(pos[0], pos[1]))
+        return bucket is not None and tuple(pos) in bucket
+
+    def __len__(self) -> int:
+        return self.count
+
+    def has_coin(self, xs: NDArray[np.int64], ys: NDArray[np.int64]) -> NDArray[np.bool_]:
+        """Vectorized membership test for the tiles (xs, ys)."""
+        return np.array([pos in self for pos in zip(xs.tolist(), ys.tolist())], dtype=bool)
+
+    def remove(self, pos: Pos) -> None:
+        pos = (int(pos[0]), int(pos[1]))
+        bucket = self._buckets.get(self._bucket_of(pos[0], pos[1]))
+        if bucket is None or pos not in bucket:
+            return
+        bucket.remove(pos)
+        self.count -= 1
+
+    def remove_many(self, xs: NDArray[np.int64], ys: NDArray[np.int64]) -> None:
+        for pos in zip(xs.tolist(), ys.tolist()):
+            self.remove(pos)
+
+    def _ring(self, bx: int, by: int, r: int) -> Iterable[Tuple[int, int]]:
+        """Buckets at Chebyshev distance r (in buckets) from (bx, by)."""
+        if r == 0:
+            yield bx, by
+            return
+        for i in range(bx - r, bx + r + 1):
+            yield i, by - r
+            yield i, by + r
+        for j in range(by - r + 1, by + r):
+            yield bx - r, j
+            yield bx + r, j
+
+    def nearest(self, pos: Pos, max_distance: Optional[int] = None) -> Optional[Pos]:
+        """Closest coin to pos (Manhattan), or None if there is none within max_distance."""
+        if self.count == 0:
+            return None
+
+        x, y = pos
+        bx, by = self._bucket_of(x, y)
+        max_ring = max(bx, by, self.n_buckets_x - 1 - bx, self.n_buckets_y - 1 - by)
+        best: Optional[Tuple[int, int, int]] = None  # (d, y, x)
+        for r in range(max_ring + 1):
+            # Every coin in ring r is at least (r - 1) * bucket_size + 1 cells away
+            lower_bound = (r - 1) * self.bucket_size + 1 if r > 0 else 0
+            if best is not None and best[0] < lower_bound:
+                break
+            if max_distance is not None and lower_bound > max_distance:
+                break
+            for key in self._ring(bx, by, r):
+                bucket = self._buckets.get(key)
+                if not bucket:
+                    continue
+                for cx, cy in bucket:
+                    candidate = (abs(cx - x) + abs(cy - y), cy, cx)
+                    if best is None or candidate < best:
+                        best = candidate
+
+        if best is None or (max_distance is not None and best[0] > max_distance):
+            return None
+        return best[2], best[1]
+
+
+class DistanceTransform:
+    """
+    Manhattan distance from every cell of a 0/1 grid to its closest coin.
+
+    - Each cell stores one integer key d * (H * W) + y * W + x, where d is the
+      distance to the closest coin and (x, y) is that coin. Comparing keys compares
+      (d, y, x), so ties fall as in `closest_coin`.
+    - Built once per grid with a forward and a backward sweep along each axis.
+    - Removing a coin recomputes only the cells whose closest coin it was.
+    - Same query interface as `CoinIndex`, but each query is a single lookup.
+    """
+
+    _NO_COIN = np.iinfo(np.int64).max // 2
+
+    def __init__(self, grid: np.ndarray) -> None:
+        if grid.ndim != 2:
+            raise ValueError("grid must be 2D")
+
+        self.height, self.width = grid.shape
+        self._n_cells = self.height * self.width
+        ys, xs = np.nonzero(grid == 1)
+        keys = np.full(grid.shape, self._NO_COIN, dtype=np.int64)
+        keys[ys, xs] = ys * self.width + xs
+        self.keys = self._sweep(keys)
+        self.count = len(xs)
+
+    def _sweep(self, keys: NDArray[np.int64]) -> NDArray[np.int64]:
+        """Lower each key to the min over cells q of key(q) + |p - q| * H * W.
+
+        Along one axis, min over q <= p of key(q) + (p - q) * step is a running
+        minimum of key(q) - q * step, shifted back by p * step; a reversed running
+        minimum covers q >= p. Doing both axes in turn covers the whole grid.
+        """
+        step = self._n_cells
+        rows = np.arange(keys.shape[0], dtype=np.int64)[:, None] * step
+        keys = np.minimum(
+            np.minimum.accumulate(keys - rows, axis=0) + rows,
+            np.minimum.accumulate((keys + rows)[::-1], axis=0)[::-1] - rows,
+        )
+        cols = np.arange(keys.shape[1], dtype=np.int64) * step
+        keys = np.minimum(
+            np.minimum.accumulate(keys - cols, axis=1) + cols,
+            np.minimum.accumulate((keys + cols)[:, ::-1], axis=1)[:, ::-1] - cols,
+        )
+        return np.minimum(keys, self._NO_COIN)
+
+    def __contains__(self, pos: Pos) -> bool:
+        return self.keys[pos[1], pos[0]] == pos[1] * self.width + pos[0]
+
+    def __len__(self) -> int:
+        return self.count
+
+    def has_coin(self, xs: NDArray[np.int64], ys: NDArray[np.int64]) -> NDArray[np.bool_]:
+        """Vectorized membership test for the tiles (xs, ys)."""
+        return self.keys[ys, xs] == ys * self.width + xs
+
+    def distance(self, pos: Pos) -> Optional[int]:
+        key = int(self.keys[pos[1], pos[0]])
+        return None if key >= self._NO_COIN else key // self._n_cells
+
+    def nearest(self, pos: Pos, max_distance: Optional[int] = None) -> Optional[Pos]:
+        """Closest coin to pos (Manhattan), or None if there is none within max_distance."""
+        key = int(self.keys[pos[1], pos[0]])
+        if key >= self._NO_COIN:
+            return None
+        d, cell = divmod(key, self._n_cells)
+        if max_distance is not None and d > max_distance:
+            return None
+        return cell % self.width, cell // self.width
+
+    def remove(self, pos: Pos) -> None:
+        if pos not in self:
+            return
+        x, y = int(pos[0]), int(pos[1])
+        coin = y * self.width + x
+
+        # Cells pointing at this coin form a connected region around it: grow a
+        # box until no such cell lies on a border that could extend further.
+        r = 4
+        while True:
+            x0, x1 = max(x - r, 0), min(x + r, self.width - 1)
+            y0, y1 = max(y - r, 0), min(y + r, self.height - 1)
+            box = self.keys[y0:y1 + 1, x0:x1 + 1]
+            affected = (box < self._NO_COIN) & (box % self._n_cells == coin)
+            spills = (
+                (x0 > 0 and affected[:, 0].any())
+                or (x1 < self.width - 1 and affected[:, -1].any())
+                or (y0 > 0 and affected[0].any())
+                or (y1 < self.height - 1 and affected[-1].any())
+            )
+            if not spills:
+                break
+            r *= 2
+
+        # Their new closest coin is reached through a cell next to the region, so
+        # re-sweeping the region's bounding box plus a margin of one is enough.
+        rows, cols = np.nonzero(affected)
+        ry0, ry1 = max(rows.min() - 1, 0), min(rows.max() + 2, box.shape[0])
+        rx0, rx1 = max(cols.min() - 1, 0), min(cols.max() + 2, box.shape[1])
+        region = box[ry0:ry1, rx0:rx1]
+        affected = affected[ry0:ry1, rx0:rx1]
+        seeds = np.where(affected, self._NO_COIN, region)
+        region[affected] = self._sweep(seeds)[affected]
+        self.count -= 1
+
+    def remove_many(self, xs: NDArray[np.int64], ys: NDArray[np.int64]) -> None:
+        for pos in zip(xs.tolist(), ys.tolist()):
+            self.remove(pos)
+
+    def copy(self) -> "DistanceTransform":
+        duplicate = DistanceTransform.__new__(DistanceTransform)
+        duplicate.__dict__.update(self.__dict__)
+        duplicate.keys = self.keys.copy()
+        return duplicate
+
+
+class WindowCounts:
+    """
+    Number of coins in square windows and diamonds around any cell of a 0/1 grid.
+
+    - square(xs, ys, r) counts coins with |dx| <= r and |dy| <= r, e.g. the
+      (2 * gear + 1) x (2 * gear + 1) window of a gear (gear_1_3x3_window.png...).
+    - diamond(xs, ys, r) counts coins with |dx| + |dy| <= r (Manhattan reach).
+    - Both read four entries of a summed-area table, so a query costs O(1) per
+      cell whatever the radius; xs, ys and r broadcast against each other.
+    - Diamonds are squares in rotated coordinates u = x + y, v = x - y + H - 1,
+      so they have their own table over a (H + W - 1) square grid.
+    - Removing a coin updates both tables in place instead of rebuilding them.
+    """
+
+    # Above this many coins at once, remove_many rebuilds the tables instead
+    _REBUILD_AFTER = 16
+
+    def __init__(self, grid: np.ndarray) -> None:
+        if grid.ndim != 2:
+            raise ValueError("grid must be 2D")
+        self.height, self.width = grid.shape
+        self.coins = grid == 1
+        self._build()
+
+    def _build(self) -> None:
+        self._square = self._table(self.coins)
+        ys, xs = np.nonzero(self.coins)
+        size = self.height + self.width - 1
+        rotated = np.zeros((size, size), dtype=bool)
+        rotated[xs + ys, xs - ys + self.height - 1] = True
+        self._diamond = self._table(rotated)
+        self.count = len(xs)
+
+    @staticmethod
+    def _table(mask: NDArray[np.bool_]) -> NDArray[np.int32]:
+        """Summed-area table with a zero first row and column."""
+        table = np.zeros((mask.shape[0] + 1, mask.shape[1] + 1), dtype=np.int32)
+        np.cumsum(np.cumsum(mask, axis=0, dtype=np.int32), axis=1, out=table[1:, 1:])
+        return table
+
+    @staticmethod
+    def _box(table: NDArray[np.int32], row0: NDArray, row1: NDArray, col0: NDArray, col1: NDArray) -> NDArray[np.int64]:
+        """Sum of the cells in rows row0..row1 and cols col0..col1 (inclusive), clipped to the table."""
+        n_rows, n_cols = table.shape[0] - 1, table.shape[1] - 1
+        r0, r1 = np.clip(row0, 0, n_rows), np.clip(row1 + 1, 0, n_rows)
+        c0, c1 = np.clip(col0, 0, n_cols), np.clip(col1 + 1, 0, n_cols)
+        return table[r1, c1].astype(np.int64) - table[r0, c1] - table[r1, c0] + table[r0, c0]
+
+    def __contains__(self, pos: Pos) -> bool:
+        return bool(self.coins[pos[1], pos[0]])
+
+    def __len__(self) -> int:
+        return self.count
+
+    def square(self, xs: NDArray, ys: NDArray, radius: Union[int, NDArray]) -> NDArray[np.int64]:
+        """Coins in the (2 * radius + 1) square window centred on each (x, y)."""
+        xs, ys, radius = np.asarray(xs), np.asarray(ys), np.asarray(radius)
+        return self._box(self._square, ys - radius, ys + radius, xs - radius, xs + radius)
+
+    def diamond(self, xs: NDArray, ys: NDArray, radius: Union[int, NDArray]) -> NDArray[np.int64]:
+        """Coins at Manhattan distance at most radius from each (x, y)."""
+        xs, ys, radius = np.asarray(xs), np.asarray(ys), np.asarray(radius)
+        us, vs = xs + ys, xs - ys + self.height - 1
+        return self._box(self._diamond, us - radius, us + radius, vs - radius, vs + radius)
+
+    def remove(self, pos: Pos) -> None:
+        x, y = int(pos[0]), int(pos[1])
+        if not self.coins[y, x]:
+            return
+        self.coins[y, x] = False
+        # A cell contributes to every entry below and to the right of it
+        self._square[y + 1:, x + 1:] -= 1
+        self._diamond[x + y + 1:, x - y + self.height:] -= 1
+        self.count -= 1
+
+    def remove_many(self, xs: NDArray[np.int64], ys: NDArray[np.int64]) -> None:
+        if len(xs) > self._REBUILD_AFTER:
+            self.coins[ys, xs] = False
+            self._build()
+            return
+        for pos in zip(xs.tolist(), ys.tolist()):
+            self.remove(pos)
+
+
+@lru_cache(maxsize=64)
+def diamond_offsets(radius: int) -> NDArray[np.int64]:
+    """Offsets (dx, dy) with |dx| + |dy| <= radius, sorted by (distance, dy, dx).
+
+    Scanning the offsets in this order and keeping the first coin found gives the
+    same target as `closest_coin`, including its (y, x) tie-break.
+    """
+    r = np.arange(-radius, radius + 1)
+    dx, dy = np.meshgrid(r, r)
+    dx, dy = dx.ravel(), dy.ravel()
+    d = np.abs(dx) + np.abs(dy)
+    keep = d <= radius
+    dx, dy, d = dx[keep], dy[keep], d[keep]
+    order = np.lexsort((dx, dy, d))
+    offsets = np.stack([dx[order], dy[order]], axis=1)
+    offsets.flags.writeable = False
+    return offsets
+
+
+class CoinOverlay:
+    """
+    Copy-on-write view of a shared `DistanceTransform`.
+
+    - The base transform (and the grid it was built from) is never modified, so
+      any number of overlays, in any number of threads, can share it.
+    - Removed coins are kept in a small set of flat cell indices.
+    - Nearest-coin queries use the base lookup and only fall back to scanning the
+      diamond around the query cell when the base answer was removed.
+    - Same query interface as `DistanceTransform`.
+    """
+
+    def __init__(self, base: DistanceTransform) -> None:
+        self.base = base
+        self.height, self.width = base.height, base.width
+        self.removed: set = set()
+
+    @property
+    def count(self) -> int:
+        return self.base.count - len(self.removed)
+
+    def __contains__(self, pos: Pos) -> bool:
+        return pos in self.base and pos[1] * self.width + pos[0] not in self.removed
+
+    def __len__(self) -> int:
+        return self.count
+
+    def has_coin(self, xs: NDArray[np.int64], ys: NDArray[np.int64]) -> NDArray[np.bool_]:
+        """Vectorized membership test for the tiles (xs, ys)."""
+        present = self.base.has_coin(xs, ys)
+        if self.removed:
+            for i in np.flatnonzero(present).tolist():
+                if int(ys[i]) * self.width + int(xs[i]) in self.removed:
+                    present[i] = False
+        return present
+
+    def nearest(self, pos: Pos, max_distance: Optional[int] = None) -> Optional[Pos]:
+        """Closest coin to pos (Manhattan), or None if there is none within max_distance."""
+        best = self.base.nearest(pos, max_distance)
+        if best is None or best[1] * self.width + best[0] not in self.removed:
+            return best
+
+        # Removals only push the closest coin farther away: scan the base coins
+        # within max_distance in (d, y, x) order and keep the first live one
+        x, y = int(pos[0]), int(pos[1])
+        offsets = diamond_offsets(self.width + self.height if max_distance is None else max_distance)
+        xs, ys = x + offsets[:, 0], y + offsets[:, 1]
+        inside = (xs >= 0) & (xs < self.width) & (ys >= 0) & (ys < self.height)
+        xs, ys = xs[inside], ys[inside]
+        coins = np.flatnonzero(self.base.has_coin(xs, ys))
+        for cell in (ys[coins] * self.width + xs[coins]).tolist():
+            if cell not in self.removed:
+                return cell % self.width, cell // self.width
+        return None
+
+    def remove(self, pos: Pos) -> None:
+        if pos in self:
+            self.removed.add(int(pos[1]) * self.width + int(pos[0]))
+
+    def remove_many(self, xs: NDArray[np.int64], ys: NDArray[np.int64]) -> None:
+        """Remove the coins on the tiles (xs, ys); tiles without a coin are ignored."""
+        present = self.has_coin(xs, ys)
+        self.removed.update((ys[present] * self.width + xs[present]).tolist())
+
+    def copy(self) -> "CoinOverlay":
+        duplicate = CoinOverlay(self.base)
+        duplicate.removed = set(self.removed)
+        return duplicate
+
+
+RECORD_MODES = ("full", "collected", "none")
+SCHEDULES = ("sequential", "lockstep")
+
+
+@lru_cache(maxsize=1024)
+def _zigzag_offsets(dx: int, dy: int) -> Tuple[NDArray[np.int64], NDArray[np.int64]]:
+    a, b = abs(dx), abs(dy)
+    n_moves = max(2 * a - 1, 2 * b) if a > 0 else max(2 * b - 1, 0)
+    along_x = np.arange(n_moves) % 2 == (0 if a > 0 else 1)
+    offsets_x = np.sign(dx) * np.minimum(np.cumsum(along_x), a)
+    offsets_y = np.sign(dy) * np.minimum(np.cumsum(~along_x), b)
+    offsets_x.flags.writeable = False
+    offsets_y.flags.writeable = False
+    return offsets_x, offsets_y
+
+
+def zigzag_path(start: Pos, target: Pos) -> Tuple[NDArray[np.int64], NDArray[np.int64]]:
+    """Tiles entered walking from start to target, as (xs, ys) arrays.
+
+    Moves alternate between axes, starting along x when there is x distance to
+    cover. A move along an axis that is already aligned with the target stays in
+    place, so that tile appears twice in a row.
+    """
+    offsets_x, offsets_y = _zigzag_offsets(target[0] - start[0], target[1] - start[1])
+    return start[0] + offsets_x, start[1] + offsets_y
+
+
 @dataclass
 class StepResult:
     turn: int
@@ -101,6 +525,17 @@ class StepResult:
     to_pos: Pos
 
 
+@dataclass
+class RewardEstimate:
+    """Monte Carlo summary of coins collected per forager."""
+    mean: NDArray[np.float64]
+    variance: NDArray[np.float64]
+    ci_low: NDArray[np.float64]
+    ci_high: NDArray[np.float64]
+    n_samples: int
+    confidence: float
+
+
 class ForagerBot:
     """
     Greedy coin collector on a 2D 0/1 grid.
@@ -109,13 +544,40 @@ class ForagerBot:
     - Agent position is (x, y) where x is column, y is row.
     - Each turn: jump to closest coin (Manhattan distance), collect it, record visit.
     - Ties: deterministic by (y, x).
+    - Coins are looked up through an index kept in sync with the grid: a
+      `DistanceTransform` by default, or any class with the same interface
+      such as `CoinIndex` or `CoinOverlay`.
+    - The index decides which tiles hold coins. A read-only grid is left
+      untouched, so a bot on a shared base grid records its collections only
+      in its index (e.g. a `CoinOverlay`).
+    - Positions may be given as tuples or arrays; trajectories are returned as
+      (n, 2) arrays of (x, y).
+    - Trajectories are kept in preallocated (n, 2) integer arrays sized for
+      MAX_MOVEMENT(max_speed) moves. `record` chooses what is stored: every
+      visited tile ("full"), only the collected coins ("collected") or nothing
+      but the counts ("none").
     """
 
-    def __init__(self, grid: np.ndarray, start: Pos, max_speed: int = 1) -> None:
+    # Coins farther than this are ignored in favour of a random step
+    sight_radius: int = 5
+    coin_index = DistanceTransform
+
+    def __init__(
+        self,
+        grid: np.ndarray,
+        start: Pos,
+        max_speed: int = 1,
+        rng: Optional[np.random.Generator] = None,
+        coins: Optional[Union[DistanceTransform, CoinOverlay]] = None,
+        record: str = "full",
+    ) -> None:
         if grid.ndim != 2:
             raise ValueError("grid must be 2D")
+        assert record in RECORD_MODES, f"Error: record should be one of {RECORD_MODES}, but got {record}"
 
         self.grid = grid
+        # An index already in sync with grid can be handed over to skip building one
+        self.coins = self.coin_index(grid) if coins is None else coins
         self.height, self.width = grid.shape
         self.reach = max_speed
         self.collection_chance = COLLECTION_CHANCE(max_speed)
@@ -124,32 +586,73 @@ class ForagerBot:
         if not in_bounds(x, y, self.width, self.height):
             raise ValueError(f"start {start} out of bounds for grid (W={self.width}, H={self.height})")
 
-        self.pos: Pos = start
+        self.pos: Pos = (int(x), int(y))
         self.turn: int = 0
 
-        self.visited: List[Pos] = [tuple(start)]
-        self.collected: List[Pos] = []
+        # Start tile plus one tile per unit of fuel
+        capacity = MAX_MOVEMENT(max_speed) + 1
+        dtype = np.int16 if max(self.width, self.height) <= np.iinfo(np.int16).max else np.int32
+        self.record = record
+        self._visited = np.empty((capacity if record == "full" else 0, 2), dtype=dtype)
+        self._collected = np.empty((min(capacity, self.coins.count) if record != "none" else 0, 2), dtype=dtype)
+        self.n_visited: int = 1
+        self.n_collected: int = 0
+        if record == "full":
+            self._visited[0] = self.pos
 
         self.collection_chance: float = COLLECTION_CHANCE(max_speed)  # Default reach=1
-        self._rng = RNG
+        if rng is None:
+            rng = SEEDS.rng("bot", stable_key(grid.tobytes()), self.pos, max_speed)
+        self._rng = rng
 
     @property
     def coins_remaining(self) -> int:
-        return int(self.grid.sum())
+        return self.coins.count
+
+    @property
+    def visited(self) -> NDArray[np.int16]:
+        """Visited tiles as (x, y) rows (empty unless record is "full")."""
+        return self._visited[:self.n_visited] if self.record == "full" else self._visited
+
+    @property
+    def collected(self) -> NDArray[np.int16]:
+        """Collected coins as (x, y) rows (empty if record is "none")."""
+        return self._collected[:self.n_collected] if self.record != "none" else self._collected
+
+    @staticmethod
+    def _store(buffer: NDArray, n: int, xs: NDArray, ys: NDArray) -> NDArray:
+        """Write (xs, ys) after the first n rows of buffer, growing it if it is full."""
+        needed = n + len(xs)
+        if needed > len(buffer):
+            grown = np.empty((max(needed, 2 * len(buffer)), 2), dtype=buffer.dtype)
+            grown[:n] = buffer[:n]
+            buffer = grown
+        buffer[n:needed, 0] = xs
+        buffer[n:needed, 1] = ys
+        return buffer
+
+    def _collect(self, pos: Pos) -> None:
+        if pos in self.coins:
+            if self._rng.random() < self.collection_chance:
+                if self.grid.flags.writeable:
+                    self.grid[pos[1], pos[0]] = 0
+                self.coins.remove(pos)
+                if self.record != "none":
+                    self._collected = self._store(self._collected, self.n_collected, [pos[0]], [pos[1]])
+                self.n_collected += 1
 
     def _next_target(self) -> Pos:
-        coins_xy = find_coins(self.grid)
-        pos_closest_coin = closest_coin(self.pos, coins_xy)
-        distance_to_closest_coin = manhattan(pos_closest_coin, self.pos)
-        if distance_to_closest_coin < 6:
+        pos_closest_coin = self.coins.nearest(self.pos, max_distance=self.sight_radius)
+        if pos_closest_coin is not None:
             assert in_bounds(pos_closest_coin[0], pos_closest_coin[1], self.width, self.height), f"Error: next target out of bounds: {pos_closest_coin}"
             return pos_closest_coin
         else:
+            x, y = self.pos
             adjacent_tiles = [
-                [self.pos[0], np.clip(self.pos[1] - 1, 0, self.height - 1).item()],
-                [np.clip(self.pos[0] + 1, 0, self.width - 1).item(), self.pos[1]],
-                [self.pos[0], np.clip(self.pos[1] + 1, 0, self.height - 1).item()],
-                [np.clip(self.pos[0] - 1, 0, self.width - 1).item(), self.pos[1]],
+                [x, max(y - 1, 0)],
+                [min(x + 1, self.width - 1), y],
+                [x, min(y + 1, self.height - 1)],
+                [max(x - 1, 0), y],
             ]
             adjacent_tiles = list(set([tuple(tile) for tile in adjacent_tiles]))
             # if len(adjacent_tiles) == 2:
@@ -175,9 +678,10 @@ class ForagerBot:
             assert in_bounds(random_pos[0], random_pos[1], self.width, self.height), f"Error: next target out of bounds: {random_pos}"
             return random_pos
 
-    def step(self) -> None:
+    def step(self, max_moves: Optional[int] = None) -> None:
         """
         Execute one turn. Returns StepResult, or None if no coins remain.
+        The walk stops early after max_moves moves (e.g. when fuel runs out).
         """
 
         target: Pos = self._next_target()
@@ -186,60 +690,54 @@ class ForagerBot:
         
         if target == self.pos:
             # Already on a coin
-            if self.grid[self.pos[1], self.pos[0]] == 1:
-                if self._rng.random() < self.collection_chance:
-                    self.grid[self.pos[1], self.pos[0]] = 0
-                    self.collected.append(self.pos)
+            self._collect(self.pos)
             self.turn += 1
 
-        to_pos = target
-        dx = np.abs(to_pos[0] - self.pos[0])
-        axis = "x" if dx > 0 else "y"
-        path: List[Pos] = [self.pos]
-
-        def step_x(tx) -> None:
-            x, y = self.pos
-            if x != tx:
-                x += 1 if tx > x else -1
-            path.append((x, y))
-            self.pos = (x, y)
-
-        def step_y(ty) -> None:
-            x, y = self.pos
-            if y != ty:
-                y += 1 if ty > y else -1
-            path.append((x, y))
-            self.pos = (x, y)
-
-        while self.pos != to_pos:
-
-            if axis == "x":
-                step_x(to_pos[0])
-            else:
-                step_y(to_pos[1])
-
-            axis = "y" if axis == "x" else "x"
-
-            self.visited.append(self.pos)
-
-            if self.grid[self.pos[1], self.pos[0]] == 1:
-                if self._rng.random() < self.collection_chance:
-                    self.grid[self.pos[1], self.pos[0]] = 0
-                    self.collected.append(self.pos)
+        xs, ys = zigzag_path(self.pos, target)
+        if max_moves is not None:
+            # No fuel left means no move (a negative slice would count from the end)
+            max_moves = max(max_moves, 0)
+            xs, ys = xs[:max_moves], ys[:max_moves]
+        if xs.size > 0:
+            self._walk(xs, ys)
 
         self.turn += 1
         return None
 
-    def run(self, fuel_steps: int, max_turns: Optional[int] = 100) -> List[Pos]:
+    def _walk(self, xs: NDArray[np.int64], ys: NDArray[np.int64]) -> None:
+        """Enter the tiles (xs, ys) in order, trying to collect on each one."""
+        if self.record == "full":
+            self._visited = self._store(self._visited, self.n_visited, xs, ys)
+        self.n_visited += len(xs)
+        self.pos = (int(xs[-1]), int(ys[-1]))
+
+        on_coin = np.flatnonzero(self.coins.has_coin(xs, ys))
+        if on_coin.size == 0:
+            return
+        # One draw per coin tile entered; a tile entered twice in a row (a move
+        # along an axis that is already aligned) is collected on its first success
+        hits = on_coin[self._rng.random(on_coin.size) < self.collection_chance]
+        if hits.size == 0:
+            return
+        _, first = np.unique(ys[hits] * self.width + xs[hits], return_index=True)
+        hits = hits[np.sort(first)]
+        if self.grid.flags.writeable:
+            self.grid[ys[hits], xs[hits]] = 0
+        self.coins.remove_many(xs[hits], ys[hits])
+        if self.record != "none":
+            self._collected = self._store(self._collected, self.n_collected, xs[hits], ys[hits])
+        self.n_collected += hits.size
+
+    def run(self, fuel_steps: int, max_turns: Optional[int] = 100) -> NDArray[np.int16]:
         """
         Run until all coins are collected (or max_turns reached).
-        Returns the list of StepResults.
+        Returns the visited tiles.
         """
         while self.coins_remaining > 0:
-            self.step()
+            self.step(max_moves=fuel_steps - self.n_visited)
             if self.turn >= max_turns:
                 break
-            if len(self.visited) >= fuel_steps:
+            if self.n_visited >= fuel_steps:
                 break
 
         return self.visited
@@ -248,15 +746,24 @@ class ForagerBot:
 class World:
     """2D grid world with coins placed according to a distribution.
 
-    Grid cells contain 1 if a coin is present, otherwise 0.
+    Grid cells are True if a coin is present, otherwise False.
+
+    - The grid is a bool array; packed_grid() gives it at one bit per cell.
+    - coins() caches the coin coordinates. Coins should only change through
+      place_given_coins, remove_given_coins, clear or create_and_place_coins,
+      which invalidate the cache (and the distance transform).
+    - Simulations never write the world (see reward_from_bots), so one World
+      can be evaluated from several threads: the lazy caches are built under
+      a lock, and calls without an rng draw their own stream from the world's.
     """
+    # Class-level so that worlds built through World.empty() have it too
+    _lock = threading.RLock()
     width: Optional[int] = WORLD_WIDTH
     height: Optional[int] = WORLD_HEIGHT
     coin_path: Path = ASSETS_PATHS["coin_url"]
     forager_path: Path = ASSETS_PATHS["forager_url"]
     map_path: Path = None
     num_foragers: int = NUM_FORAGERS
-    _rng = RNG
     max_percentage_of_coins: float = 1.0
     threshold: float = 0.5
     steepness: float = 15.0
@@ -272,12 +779,16 @@ class World:
         random_coins: Optional[float] = 0.01,
         x_bias: Optional[int] = 0,
         y_bias: Optional[int] = 0,
+        rng: Optional[np.random.Generator] = None,
     ) -> None:
         logger.info(f"Initializing world...")
+        if rng is None:
+            rng = SEEDS.rng("world", num_coins, num_centroids, distribution, dispersion, x_bias, y_bias)
+        self._rng = rng
         # Check width and height
         if self.width <= 0 or self.height <= 0:
             raise ValueError("width and height must be positive.")
-        self.grid = np.zeros((self.height, self.width))
+        self.grid = np.zeros((self.height, self.width), dtype=bool)
         logger.info(f"Grid of dimensions: {self.grid.shape} created...")
         # Check number of coins
         coin_percentage = num_coins / (self.width * self.height)
@@ -308,127 +819,249 @@ class World:
 
     @staticmethod
     def generate_from_json(path: Path) -> "World":
-        with open(path, "r") as f:
-            coins = json.load(f)
+        # Parsed once per process, see map_registry.MapRegistry
+        coins = MAPS.get(path).coins
         world = World.generate_from_coins(coins)
         world.map_path = path
+        world._rng = SEEDS.rng("world", path)
         return world
 
     @staticmethod
     def generate_from_coins(
-        coins: List[Pos],
+        coins: Union[List[Pos], NDArray],
     ) -> "World":
-        world_parameters = {
-            "num_coins": NUM_COINS,
-            "num_centroids": NUM_CENTROIDS,
-            "dispersion": DISPERSION,
-            "distribution": "circular"
-        }
-        # logger.info(f"Generating from coins...")
-        # logger.info(f"Step 1: initialize world...")
-        world = World(**world_parameters)
-        # logger.info(f"Step 2: place coins...")
-        world.clear()
+        world = World.empty()
         world.place_given_coins(coins)
-        # logger.info(f"World ready!")
+        world._rng = SEEDS.rng("world", "coins", world.content_key())
         return world
 
-    def place_given_coins(self, coins: List[Pos]) -> None:
-        if len(coins) == 0:
-            return
-        rows, cols = self.get_rows_and_cols(coins)
-        self.grid[rows, cols] = 1
+    @staticmethod
+    def generate_from_array(coins: NDArray) -> "World":
+        """World holding exactly the coins in an (n, 2) array of (x, y), which must be in bounds."""
+        coins = np.asarray(coins, dtype=np.int64).reshape(-1, 2)
+        world = World.empty()
+        xs, ys = coins[:, 0], coins[:, 1]
+        if np.any((xs < 0) | (xs >= world.width) | (ys < 0) | (ys >= world.height)):
+            raise ValueError(f"coins out of bounds for world (W={world.width}, H={world.height})")
+        world.grid[ys, xs] = True
+        world._coins_changed()
+        world._rng = SEEDS.rng("world", "coins", world.content_key())
+        return world
 
-    def remove_given_coins(self, coins: List[Pos]) -> None:
-        if len(coins) == 0:
-            return
+    @staticmethod
+    def empty(rng: Optional[np.random.Generator] = None) -> "World":
+        """
+        World without coins, built without going through __init__.
+        - No centroids are sampled and nothing is logged or checked: the world
+          is meant to be filled with given coins (see generate_from_coins).
+        - Parameters are those generate_from_coins has always used, so methods
+          such as create_and_place_coins still work on the result.
+        """
+        world = World.__new__(World)
+        world.num_coins = NUM_COINS
+        world.num_centroids = NUM_CENTROIDS
+        world.distribution = "circular"
+        world.dispersion = DISPERSION
+        world.random_coins = 0.01
+        world.x_bias = 0
+        world.y_bias = 0
+        if rng is None:
+            rng = SEEDS.rng("world", NUM_COINS, NUM_CENTROIDS, "circular", DISPERSION, 0, 0)
+        world._rng = rng
+        world.grid = np.zeros((world.height, world.width), dtype=bool)
+        world._coins_changed()
+        return world
+
+    def place_given_coins(self, coins: Union[List[Pos], NDArray]) -> None:
+        """Place coins given as an (n, 2) array or a list of (x, y)."""
         rows, cols = self.get_rows_and_cols(coins)
-        self.grid[rows, cols] = 0
+        if rows.size == 0:
+            return
+        self.grid[rows, cols] = True
+        self._coins_changed()
 
-    def get_rows_and_cols(self, coins:List[Pos]) -> Tuple[NDArray, NDArray]:
+    def remove_given_coins(self, coins: Union[List[Pos], NDArray]) -> None:
+        """Remove coins given as an (n, 2) array or a list of (x, y)."""
+        rows, cols = self.get_rows_and_cols(coins)
+        if rows.size == 0:
+            return
+        self.grid[rows, cols] = False
+        window_counts = getattr(self, "_window_counts", None)
+        self._coins_changed()
+        # Window counts are cheap to update in place, unlike the rest
+        if window_counts is not None:
+            window_counts.remove_many(cols, rows)
+            self._window_counts = window_counts
+
+    def _coins_changed(self) -> None:
+        """Drop everything derived from the coins, after they changed."""
+        self._coins = None
+        self._distance_transform = None
+        self._window_counts = None
+
+    def coins(self) -> NDArray[np.int64]:
+        """Read-only (n, 2) array of the coins' (x, y), row by row; cached until the coins change."""
+        with World._lock:
+            if getattr(self, "_coins", None) is None:
+                ys, xs = np.nonzero(self.grid)
+                coins = np.stack([xs, ys], axis=1)
+                coins.flags.writeable = False
+                self._coins = coins
+            return self._coins
+
+    def packed_grid(self) -> NDArray[np.uint8]:
+        """The grid at one bit per cell (np.packbits, row-major)."""
+        return np.packbits(self.grid)
+
+    def content_key(self) -> int:
+        """Stable key of the coins, e.g. to derive random streams from them."""
+        return stable_key(self.packed_grid().tobytes())
+
+    def distance_transform(self) -> DistanceTransform:
+        """Distance transform of the current coins, built once and reused until they change."""
+        with World._lock:
+            if getattr(self, "_distance_transform", None) is None:
+                self._distance_transform = DistanceTransform(self.grid)
+            return self._distance_transform
+
+    def window_counts(self) -> WindowCounts:
+        """Coin counts around cells (see WindowCounts), built once and kept up to date on removals."""
+        with World._lock:
+            if getattr(self, "_window_counts", None) is None:
+                self._window_counts = WindowCounts(self.grid)
+            return self._window_counts
+
+    def frozen_grid(self) -> np.ndarray:
+        """Read-only view of the grid, for bots that keep their collections in an overlay."""
+        grid = self.grid.view()
+        grid.flags.writeable = False
+        return grid
+
+    def get_rows_and_cols(self, coins: Union[List[Pos], NDArray]) -> Tuple[NDArray[np.int64], NDArray[np.int64]]:
+        """Rows and columns of coins ((n, 2) array or list of (x, y)).
+
+        Coordinates outside the grid are replaced by random ones inside it.
+        """
+        coins = as_coords(coins)
         # Separate x and y
-        xs, ys = zip(*coins)
+        rows, cols = coins[:, 1].copy(), coins[:, 0].copy()
         # Make sure coins are inside boundaries
-        ys = [y if 0 <= y < WORLD_HEIGHT else self._rng.integers(0, WORLD_HEIGHT - 1) for y in ys]
-        xs = [x if 0 <= x < WORLD_WIDTH else self._rng.integers(0, WORLD_WIDTH - 1) for x in xs]
-        # Convert to arrays
-        rows = np.array(ys)
-        cols = np.array(xs)
+        outside = (rows < 0) | (rows >= self.height)
+        if outside.any():
+            rows[outside] = self._rng.integers(0, self.height - 1, size=outside.sum())
+        outside = (cols < 0) | (cols >= self.width)
+        if outside.any():
+            cols[outside] = self._rng.integers(0, self.width - 1, size=outside.sum())
         return rows, cols
 
     def coin_positions(self) -> List[Pos]:
-        """List of (row, col) positions where coins are present."""
-        rc = np.argwhere(self.grid == 1)  # (row, col)
-        coin_positions = [(int(c), int(r)) for r, c in rc]  # (x, y)
-        return coin_positions
+        """List of (x, y) positions where coins are present (see coins for the array)."""
+        return list(map(tuple, self.coins().tolist()))
 
     def save_world(self) -> None:
         with open(self.map_path, "w") as map_file:
-            json.dump(self.coin_positions(), map_file)
+            json.dump(self.coins().tolist(), map_file)
 
     def count_coins(self) -> int:
         """Return the number of coins currently placed."""
-        return self.grid.sum()
+        return len(self.coins())
 
     def clear(self) -> None:
-        """Remove all coins (set all cells to 0)."""
-        self.grid = np.zeros((self.height, self.width))
+        """Remove all coins (set all cells to False)."""
+        self.grid = np.zeros((self.height, self.width), dtype=bool)
+        self._coins_changed()
 
-    def create_and_place_coins(self) -> None:
-        """Create and place coins."""
+    def create_and_place_coins(
+        self,
+        coins_per_centroid: Optional[Iterable[int]] = None,
+        dispersions: Optional[Union[float, Iterable[float], NDArray]] = None,
+    ) -> None:
+        """
+        Create and place coins around the centroids (see get_centroids).
+        - coins_per_centroid: coins sampled around each centroid; by default
+          num_coins split evenly, the remainder going to the last centroid.
+        - dispersions: one variance for every centroid, one per centroid, or
+          one 2x2 covariance per centroid ((num_centroids, 2, 2)); defaults to
+          self.dispersion.
+        - All centroids are sampled at once (see sample_clusters) and coins
+          falling off the grid are clipped to its border.
+        """
         self.clear()
-        if self.num_coins == 0:
+        if self.num_coins == 0 or self.num_centroids <= 0:
             return
 
-        if self.num_centroids > 0:
-            coins_per_centroid = self.num_coins // self.num_centroids
-            offset = self.num_coins - coins_per_centroid * self.num_centroids
-            coins_per_centroid = [coins_per_centroid for _ in range(self.num_centroids)]
-            if offset > 0:
-                coins_per_centroid[-1] += offset
-
-            centroids = self.get_centroids()
-            for i, (x, y) in enumerate(centroids):
-                n_coins = coins_per_centroid[i]
-                sample_coins = self.sample_bivariate_normal(
-                    mean=(x, y),
-                    cov=((self.dispersion, 0), (0, self.dispersion)),
-                    n=n_coins,
-                )
-                # Convert to integer coordinates
-                coords_x = np.array([int(x) for x, _ in sample_coins])
-                coords_y = np.array([int(y) for _, y in sample_coins])
-                # Keep only coins inside boundaries
-                coords_x = np.clip(coords_x, 0, self.width - 1)
-                coords_y = np.clip(coords_y, 0, self.height - 1)
-                # Place coins
-                self.grid[coords_y, coords_x] = 1
+        if coins_per_centroid is None:
+            coins_per_centroid = np.full(self.num_centroids, self.num_coins // self.num_centroids)
+            coins_per_centroid[-1] += self.num_coins - coins_per_centroid.sum()
+        if dispersions is None:
+            dispersions = self.dispersion
+        centroids = self.centroids().astype(float)
+        samples = self.sample_clusters(centroids, dispersions, coins_per_centroid)
+        # Convert to integer coordinates (truncating, as int() does)
+        coords = samples.astype(np.int64)
+        # Keep only coins inside boundaries
+        coords_x = np.clip(coords[:, 0], 0, self.width - 1)
+        coords_y = np.clip(coords[:, 1], 0, self.height - 1)
+        # Place coins
+        self.grid[coords_y, coords_x] = True
+        self._coins_changed()
+
+    def sample_clusters(
+        self,
+        means: NDArray,
+        covs: Union[float, Iterable[float], NDArray],
+        counts: Iterable[int],
+    ) -> NDArray[np.float64]:
+        """
+        Sample counts[i] points around means[i] for every cluster, in one call.
+
+        - means: (k, 2) array of (x, y).
+        - covs: a variance shared by all clusters, one variance per cluster,
+          or (k, 2, 2) covariance matrices (positive definite).
+        - Returns a (sum(counts), 2) array, cluster by cluster.
+        """
+        means = np.asarray(means, dtype=float).reshape(-1, 2)
+        counts = np.asarray(counts, dtype=np.int64)
+        k = len(means)
+        assert counts.shape == (k,), f"Error: expected {k} coin counts, but got {counts.shape}"
+        assert np.all(counts >= 0), f"Error: coin counts must be non-negative, but got {counts}"
+        covs = np.asarray(covs, dtype=float)
+        if covs.ndim < 2:
+            covs = np.broadcast_to(covs, (k,))[:, None, None] * np.eye(2)
+        assert covs.shape == (k, 2, 2), f"Error: expected covariances of shape {(k, 2, 2)}, but got {covs.shape}"
+        # x = mean + L z with L L^T = cov, for every sample of every cluster
+        factors = np.linalg.cholesky(covs)
+        labels = np.repeat(np.arange(k), counts)
+        z = self._rng.standard_normal((labels.size, 2))
+        return means[labels] + np.einsum("nij,nj->ni", factors[labels], z)
 
     def get_centroids(self) -> List[Pos]:
-        """Return the centroids of coins placed."""
+        """Return the centroids of coins placed, as a list of (x, y) (see centroids)."""
+        return list(map(tuple, self.centroids().tolist()))
+
+    def centroids(self) -> NDArray[np.int64]:
+        """Return the centroids of coins placed, as an (num_centroids, 2) array of (x, y)."""
         if self.num_centroids == 1:
-            sample = [(int(self.width / 2), int(self.height / 2))]
+            xs = np.array([int(self.width / 2)])
+            ys = np.array([int(self.height / 2)])
 
         elif self.distribution == "linear_down":
             sample = np.linspace(0, 1, self.num_centroids + 2)[1:-1]
-            sample = [(int(x * self.width), int(x * self.height)) for x in sample]
+            xs = (sample * self.width).astype(np.int64)
+            ys = (sample * self.height).astype(np.int64)
 
         elif self.distribution == "linear_up":
             sample = np.linspace(0, 1, self.num_centroids + 2)[1:-1]
-            sample = [(int(x * self.width), self.height - int(x * self.height)) for x in sample]
+            xs = (sample * self.width).astype(np.int64)
+            ys = self.height - (sample * self.height).astype(np.int64)
 
         elif self.distribution == "circular":
             sample = np.linspace(0, 1, self.num_centroids + 1)[:-1]
             theta = (2.0 * np.pi) * sample
-            x = np.cos(theta).tolist()
-            y = np.sin(theta).tolist()
-            sample = list(zip(x, y))
-
             x_scale = 0.1 * self.width
             y_scale = 0.1 * self.height
-            sample = [(x * x_scale, y * y_scale) for x, y in sample]
-            sample = [(x + 0.5 * self.width, y + 0.5 * self.height) for x, y in sample]
-            sample = [(int(x), int(y)) for x, y in sample]
+            xs = (np.cos(theta) * x_scale + 0.5 * self.width).astype(np.int64)
+            ys = (np.sin(theta) * y_scale + 0.5 * self.height).astype(np.int64)
 
         elif self.distribution == "random":
             sample = self.sample_bivariate_normal(
@@ -437,10 +1070,8 @@ class World:
                 n=self.num_centroids,
             )
             slack = self.dispersion * 1.2
-            sample = [
-                (int(np.clip(x, slack, self.width - slack)), int(np.clip(y, slack, self.height - slack)))
-                for x, y in sample
-            ]
+            xs = np.clip(sample[:, 0], slack, self.width - slack).astype(np.int64)
+            ys = np.clip(sample[:, 1], slack, self.height - slack).astype(np.int64)
 
         elif self.distribution == "oval":
             raise NotImplementedError("oval dispersion is not yet implemented.")
@@ -448,20 +1079,21 @@ class World:
         else:
             raise NotImplementedError(f"Dispersion {self.distribution} not supported. Choose from ['linear-up', 'linear-down', 'circular'].")
 
-        sample = [
-            (x + self.x_bias, y + self.y_bias) for x, y in sample
-        ]
-        return sample
+        return np.stack([xs + self.x_bias, ys + self.y_bias], axis=1)
 
     def create_random_coins(self, p:float) -> List[Pos]:
-        """Create random coins."""
+        """Create random coins, as a list of (x, y) (see random_coins_array)."""
+        return list(map(tuple, self.random_coins_array(p).tolist()))
+
+    def random_coins_array(self, p:float) -> NDArray[np.int64]:
+        """(n, 2) array of random coins (x, y), sorted by x then y (see random_coin_mask)."""
+        ys, xs = np.nonzero(self.random_coin_mask(p).T)[::-1]
+        return np.stack([xs, ys], axis=1)
+
+    def random_coin_mask(self, p:float) -> NDArray[np.bool_]:
+        """Each cell holds a random coin independently with probability p."""
         assert(0 <= p <= 1)
-        coins = []
-        for x in range(self.width):
-            for y in range(self.height):
-                if self._rng.random() < p:
-                    coins.append((x, y))
-        return coins
+        return self._rng.random((self.height, self.width)) < p
 
     def __str__(self) -> str:
         """ASCII representation: '1' for coin, '.' for empty."""
@@ -473,67 +1105,38 @@ class World:
 
     def render(
         self,
-        coin_zoom: float = 0.1,
+        coin_zoom: float = 0.8,
         coin_percentage: Optional[float] = 1,
-    ) -> NDArray[np.uint8]:
-        """Render the world by drawing coin images at coin positions.
+        cell_size: int = 8,
+        png: bool = False,
+    ) -> Union[NDArray[np.uint8], bytes]:
+        """Render the world by drawing the coin image at coin positions.
 
         Args:
             :param coin_zoom: Relative size of the coin inside a cell (0<zoom<=1).
             :param coin_percentage: Probability of drawing a coin.
+            :param cell_size: Side of a cell in pixels.
+            :param png: Return PNG bytes instead of the (H * cell_size, W * cell_size, 4) RGBA array.
         """
-        if not (0 < coin_zoom <= 1.0):
-            raise ValueError("coin_zoom must be in (0, 1].")
-
-        # Canvas sized roughly to grid, independent of DPI
-        fig, ax = plt.subplots(
-            figsize=(8, 5),
-            dpi=100
-        )
-
-        # Light cell grid
-        ax.set_xticks(np.arange(-.5, self.width, 1), minor=True)
-        ax.set_yticks(np.arange(-.5, self.height, 1), minor=True)
-        ax.set_xticks([])
-        ax.set_yticks([])
-        ax.set_aspect("equal")
-        # ax.set_title("World", pad=8)
-        ax.set_axis_off()
-
-        # Load coin image (RGBA supported)
-        raw_coin_img = plt.imread(self.coin_path)
-        coin_img = OffsetImage(raw_coin_img, zoom=coin_zoom)
-
-        # Place the coin image centered in each occupied cell
-        half = 0.5 * coin_zoom
-        coins = self.coin_positions()
-        for (r, c) in coins:
-            if self._rng.random() < coin_percentage:
-                coin_img.image.axes = ax
-                ab = AnnotationBbox(
-                    coin_img,
-                    (c + half, r + half),
-                    frameon=False
-                )
-                ax.add_artist(ab)
-
-        # Render the figure to a buffer
-        fig.canvas.draw()
-        # Convert to a NumPy array (RGBA)
-        rgba_bytes = fig.canvas.buffer_rgba().tobytes()
-        width, height = fig.canvas.get_width_height()
-        pil_image = PIL.Image.frombytes(mode="RGBA", size=[width, height], data=rgba_bytes)
-        img = np.array(pil_image)
-
-        plt.show()
-        plt.close(fig)
+        try:
+            # Assume running from psynet
+            from .visualization import render_grid, encode_png
+        except:
+            # If not, try normal import
+            from visualization import render_grid, encode_png
+
+        mask = None
+        if coin_percentage is not None and coin_percentage < 1:
+            mask = self._rng.random(self.grid.shape) < coin_percentage
+        image = render_grid(self.grid, cell_size=cell_size, coin_zoom=coin_zoom, coin_path=self.coin_path, mask=mask)
+        return encode_png(image) if png else image
 
     def sample_bivariate_normal(
         self,
         mean: Tuple[Number, Number],
         cov: List[Tuple[Number, Number]],
         n: int,
-    ) -> List[Pos]:
+    ) -> NDArray[np.float64]:
         """
         Sample n points from a 2D (bivariate) normal distribution.
 
@@ -548,19 +1151,12 @@ class World:
 
         Returns
         -------
-        List[Tuple[float, float]] | NDArray[np.float_]
-            The sampled coordinates.
+        NDArray[np.float_]
+            The sampled (x, y) coordinates, shape (n, 2).
         """
         mean_arr = np.asarray(mean, dtype=float)
         cov_arr = np.asarray(cov, dtype=float)
-
-        samples: NDArray[np.float64] = self._rng.multivariate_normal(
-            mean=mean_arr,
-            cov=cov_arr,
-            size=n
-        )
-
-        return [tuple(row) for row in samples]
+        return self.sample_clusters(mean_arr[None], cov_arr[None], [n])
 
     @staticmethod
     def get_probability_of_view(
@@ -586,10 +1182,15 @@ class World:
         coins = np.fliplr(coins)
         return coins
 
-    def coordinator_view(self, information_investment:float) -> List[float]:
-        # Initiate view
-        terrain = np.ones((self.height, self.width)) * 140
-        coins = self.coin_positions().copy()
+    def coordinator_view(self, information_investment:float) -> NDArray[np.uint8]:
+        """
+        Coordinator's view of the coins, shape (HEIGHT, WIDTH): 255 on the tiles
+        shown with a coin and 140 elsewhere.
+        - Candidates are the true coins plus random coins on every tile with
+          probability 1 - information_investment.
+        - As many candidates as there are true coins are drawn without
+          replacement, and each is shown with probability get_probability_of_view.
+        """
         # Determine probability of view given investment
         p = World.get_probability_of_view(
             information_investment,
@@ -598,188 +1199,373 @@ class World:
             min_value=self.min_value,
             proportion=self.proportion,
         )
-        # Add random noise
-        randomly_placed_coins = self.create_random_coins(1 - information_investment)
-        coins += randomly_placed_coins
-        # Keep only a max percentage of coins
-        max_coins = int(self.count_coins() * 1)
-        coins = self._rng.choice(coins, size=max_coins, replace=False).tolist()
-
+        # True coins and random noise, as flat cell indices
+        coins = self.coins()
+        coins = coins[:, 1] * self.width + coins[:, 0]
+        noise = np.flatnonzero(self.random_coin_mask(1 - information_investment))
+        candidates = np.concatenate([coins, noise])
+        # Keep as many candidates as there are coins
+        chosen = candidates[self._rng.choice(candidates.size, size=coins.size, replace=False)]
         # Draw coins that are randomly selected to be seen according to investment
-        for (x, y) in coins:
-            if self._rng.random() < p:
-                terrain[y, x] = 255
-        return terrain.tolist()
+        seen = chosen[self._rng.random(chosen.size) < p]
+        terrain = np.full((self.height, self.width), 140, dtype=np.uint8)
+        terrain.flat[seen] = 255
+        return terrain
 
     def generate_rgba_array(self, a_even=255, a_odd=140) -> List[float]:
-        coords = self.coin_positions()
-        xs, ys = zip(*coords)
-        rows = np.array(ys)
-        cols = np.array(xs)
-        terrain = np.ones((self.height, self.width)) * a_odd
-        terrain[rows, cols] = a_even
+        terrain = np.where(self.grid, float(a_even), float(a_odd))
         return terrain.tolist()
 
-    def generate_terrain(self) -> NDArray[np.int32]:
-        coords = self.coin_positions()
-        xs, ys = zip(*coords)
-        rows = np.array(ys)
-        cols = np.array(xs)
-        terrain = self._rng.integers(220, 255, size=(self.height, self.width))
-        terrain[rows, cols] = 0
+    def call_rng(self) -> np.random.Generator:
+        """Independent stream for one call, drawn from the world's stream under the lock."""
+        with World._lock:
+            return np.random.default_rng(self._rng.integers(np.iinfo(np.int64).max))
 
-        # Check coin positions are 0
-        coin_checks = [terrain[y, x] == 0 for x, y in coords]
-        assert(np.all(coin_checks))
+    def terrain_seed(self) -> int:
+        """Seed for the terrain noise, drawn from the world's stream."""
+        return int(self._rng.integers(2 ** 32))
 
-        return terrain.tolist()
+    def generate_terrain(self, seed: Optional[int] = None) -> NDArray[np.uint8]:
+        """
+        Terrain shown to foragers: noise in [220, 255) and 0 on the coins.
+        The noise is grid_encoding.terrain_noise(seed), which the browser can
+        rebuild from the seed alone (see grid_encoding.encode_terrain).
+        """
+        if seed is None:
+            seed = self.terrain_seed()
+        terrain = terrain_noise(seed, self.height, self.width)
+        terrain[self.grid] = 0
+        return terrain
 
-    def reward_from_bots(self, positions: List[Pos], max_speed: int) -> Tuple[List[int], List[Pos]]:
-        # Create a back up of current coins
-        available_coins = self.coin_positions().copy()
+    def reward_from_bots(
+        self,
+        positions: List[Pos],
+        max_speed: int,
+        rng: Optional[np.random.Generator] = None,
+        record: str = "full",
+        schedule: str = "sequential",
+    ) -> Tuple[List[int], List[NDArray[np.int16]]]:
+        """Coins collected and tiles visited (as recorded, see ForagerBot) per forager.
+
+        With schedule="sequential" each forager runs to the end before the next
+        one starts. With schedule="lockstep" all foragers move one turn at a time on
+        the same coins, and a coin reached by several foragers at once goes to the
+        one listed first.
+
+        Without an rng, the call gets its own stream drawn from the world's (see
+        call_rng), so concurrent calls never share a generator.
+        """
+        assert schedule in SCHEDULES, f"Error: schedule should be one of {SCHEDULES}, but got {schedule}"
+        if rng is None:
+            rng = self.call_rng()
+        if schedule == "lockstep":
+            return self._lockstep_reward_from_bots(positions, max_speed, rng, record)
+        # Foragers go one after another on a shared overlay of the coins,
+        # so each one only finds what the previous ones left behind
+        grid = self.frozen_grid()
+        coins = CoinOverlay(self.distance_transform())
         # Start record of coins colleted per bot
         coins_collected = []
         tiles_visited = []
         # Collect per position
         for location in positions:
-            collected, visited = self.bot_collect(
-                available_coins=available_coins,
-                starting_pos=location,
-                max_speed=max_speed
-            )
-            coins_collected.append(len(collected))
-            tiles_visited.append(visited)
-            self.remove_given_coins(collected)
-        # Restart original coins
-        self.place_given_coins(available_coins)
+            bot = self._run_bot(location, max_speed, rng, grid, coins, record)
+            coins_collected.append(bot.n_collected)
+            tiles_visited.append(bot.visited)
         return coins_collected, tiles_visited
 
+    def _lockstep_reward_from_bots(
+        self,
+        positions: List[Pos],
+        max_speed: int,
+        rng: np.random.Generator,
+        record: str = "full",
+    ) -> Tuple[List[int], List[NDArray[np.int16]]]:
+        try:
+            from .batch_simulation import BatchForagerSimulation
+        except:
+            from batch_simulation import BatchForagerSimulation
+        assert record in RECORD_MODES, f"Error: record should be one of {RECORD_MODES}, but got {record}"
+        simulation = BatchForagerSimulation(
+            self.grid,
+            positions,
+            max_speeds=max_speed,
+            seeds=rng.integers(np.iinfo(np.int64).max, size=len(positions), dtype=np.uint64),
+            shared_grid=True,
+            record=record == "full",
+        )
+        result = simulation.run()
+        if result.trajectories is None:
+            # Only full records keep the tiles visited, as in ForagerBot
+            tiles_visited = [np.empty((0, 2), dtype=np.int16) for _ in positions]
+        else:
+            tiles_visited = result.trajectories
+        return result.coins_collected.tolist(), tiles_visited
+
     def bot_collect(
         self,
-        available_coins: List[Pos],
+        available_coins: Optional[List[Pos]],
         starting_pos: Pos,
         max_speed: int,
-    ) -> Tuple[List[Pos], List[Pos]]:
+        rng: Optional[np.random.Generator] = None,
+        grid: Optional[np.ndarray] = None,
+        coins: Optional[Union[DistanceTransform, CoinOverlay]] = None,
+    ) -> Tuple[NDArray[np.int16], NDArray[np.int16]]:
+        bot = self._run_bot(starting_pos, max_speed, rng, grid, coins)
+        return bot.collected, bot.visited
+
+    def _run_bot(
+        self,
+        starting_pos: Pos,
+        max_speed: int,
+        rng: Optional[np.random.Generator] = None,
+        grid: Optional[np.ndarray] = None,
+        coins: Optional[Union[DistanceTransform, CoinOverlay]] = None,
+        record: str = "full",
+    ) -> ForagerBot:
+        if rng is None:
+            # As in reward_from_bots: a fresh stream per call, not one keyed by the grid
+            rng = self.call_rng()
+        if grid is None:
+            grid = self.frozen_grid()
+            coins = CoinOverlay(self.distance_transform()) if coins is None else coins
         bot = ForagerBot(
-            grid=self.grid.copy(),
+            grid=grid,
             start=starting_pos,
-            max_speed=max_speed
+            max_speed=max_speed,
+            rng=rng,
+            coins=coins,
+            record=record,
         )
-        steps = bot.run(
+        bot.run(
             fuel_steps=MAX_MOVEMENT(max_speed),
             max_turns=MAX_MOVEMENT(max_speed),
         )
-        return bot.collected, bot.visited
+        return bot
+
+    def expected_reward_from_bots(
+        self,
+        positions: List[Pos],
+        max_speed: int,
+        n_samples: int = 100,
+        workers: Optional[int] = None,
+        confidence: float = 0.95,
+        seed: Optional[int] = None,
+    ) -> RewardEstimate:
+        """Estimate the expected coins per forager over n_samples runs of reward_from_bots.
+
+        Samples are split across a process pool of `workers` processes (all cores by
+        default). Each sample draws from its own stream spawned from `seed`, or from
+        the world's stream when no seed is given, so the estimate does not depend
+        on the number of workers.
+        Confidence intervals use the normal approximation.
+        """
+        assert n_samples > 1, f"Error: need at least 2 samples to estimate a variance, got {n_samples}"
+        assert 0 < confidence < 1, f"Error: confidence must be in (0, 1), got {confidence}"
+        workers = min(workers or os.cpu_count() or 1, n_samples)
+        if seed is None:
+            streams = SEEDS.spawn(n_samples, "expected_reward", self.map_path, self.content_key())
+        else:
+            streams = np.random.SeedSequence(seed).spawn(n_samples)
+        # Consecutive samples per worker, so samples come back in order
+        bounds = np.linspace(0, n_samples, workers + 1).astype(int)
+        chunks = [streams[start:stop] for start, stop in zip(bounds[:-1], bounds[1:])]
+
+        if workers == 1:
+            samples = [_sample_rewards(self, positions, max_speed, chunks[0])]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                samples = list(pool.map(
+                    _sample_rewards,
+                    [self] * workers,
+                    [positions] * workers,
+                    [max_speed] * workers,
+                    chunks,
+                ))
+        samples = np.concatenate(samples, axis=0)
+
+        mean = samples.mean(axis=0)
+        variance = samples.var(axis=0, ddof=1)
+        z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        half_width = z * np.sqrt(variance / n_samples)
+        return RewardEstimate(
+            mean=mean,
+            variance=variance,
+            ci_low=mean - half_width,
+            ci_high=mean + half_width,
+            n_samples=n_samples,
+            confidence=confidence,
+        )
 
     def simple_bot_collect(
         self,
-        available_coins: List[Pos],
+        available_coins: Union[List[Pos], NDArray],
         location: Pos,
         collection_probability: Optional[float] = 0.7,
         max_distance: Optional[float] = 15.0
-    ) -> List[tuple]:
-        coins_collected = []
-        for coin in available_coins:
-            distance = World.get_distance(location, coin)
-            if distance < max_distance:
-                if self._rng.random() < collection_probability:
-                    coins_collected.append(coin)
-        return coins_collected
+    ) -> Union[List[tuple], NDArray]:
+        """
+        Coins within (Euclidean) max_distance of location, each kept with collection_probability.
+        Returns an array for an array of coins, otherwise a list of the given coins.
+        """
+        coins = as_coords(available_coins)
+        within = np.flatnonzero(World.get_distance(coins, location) < max_distance)
+        # One draw per coin in range, in order
+        kept = within[self._rng.random(within.size) < collection_probability]
+        if isinstance(available_coins, np.ndarray):
+            return available_coins[kept]
+        available_coins = list(available_coins)
+        return [available_coins[i] for i in kept.tolist()]
 
     def show_bots(
         self,
         locations: List[Pos],
         max_distance: Optional[float] = 15.0,
-        ax: Optional[matplotlib.axes.Axes] = None,
-    ) -> matplotlib.axes.Axes:
-        if ax is None:
-            fig, ax = plt.subplots(
-                figsize=(8, 5),
-                dpi=100
-            )
-        img = self.generate_terrain()
-        ax.imshow(img)
-        for location in locations:
-            x, y = location
-            r = max_distance
-            c = Circle(
-                (x, y), r,
-                facecolor = "none",  # no fill
-                edgecolor = "red",  # red perimeter
-                linewidth = 4,  # thick outline (adjust as needed)
-            )
-            ax.add_patch(c)
-        ax.axis('off')
-        return ax
+        ax: Optional["matplotlib.axes.Axes"] = None,
+    ) -> "matplotlib.axes.Axes":
+        """Plot the terrain with a circle of radius max_distance around each bot (see visualization.show_bots)."""
+        try:
+            # Assume running from psynet
+            from .visualization import show_bots
+        except:
+            # If not, try normal import
+            from visualization import show_bots
+        return show_bots(self, locations, max_distance, ax)
 
     @staticmethod
-    def get_distance(point1, point2) -> float:
-        x1, y1 = point1
-        x2, y2 = point2
-        return np.sqrt((x1 - x2) ** 2 + (y1 - y2) ** 2)
+    def get_distance(point1, point2) -> Union[float, NDArray[np.float64]]:
+        """Euclidean distance between points (x, y), or between the rows of (n, 2) arrays."""
+        dx, dy = (np.asarray(point1) - np.asarray(point2)).T
+        return np.hypot(dx, dy)
+
+
+def _sample_rewards(
+    world: World,
+    positions: List[Pos],
+    max_speed: int,
+    streams: List[np.random.SeedSequence],
+) -> NDArray[np.int64]:
+    """Coins collected per forager for one run per stream, shape (len(streams), n_foragers)."""
+    samples = np.zeros((len(streams), len(positions)), dtype=np.int64)
+    for i, stream in enumerate(streams):
+        rng = np.random.default_rng(stream)
+        coins_collected, _ = world.reward_from_bots(positions, max_speed, rng=rng, record="none")
+        samples[i] = coins_collected
+    return samples
+
+
+@dataclass
+class RewardBreakdown:
+    """
+    Payoffs for many allocations at once (see batch_rewards).
+
+    Every field has the leading shape of the coins, and forager fields have
+    one more axis with one entry per forager.
+    """
+    n_coins: NDArray[np.int64]
+    remaining: NDArray[np.int64]
+    salary: NDArray[np.int64]
+    commissions: NDArray[np.int64]
+    coordinator: NDArray[np.int64]
+    foragers: NDArray[np.int64]
+
+
+def _truncate(values: NDArray[np.float64]) -> NDArray[np.int64]:
+    """Round toward zero, as int() does."""
+    return np.trunc(values).astype(np.int64)
+
+
+def batch_rewards(
+    coins: Union[List[int], NDArray],
+    overhead: Union[float, NDArray],
+    wages: Union[float, NDArray],
+    investment: Union[float, NDArray],
+) -> RewardBreakdown:
+    """
+    Coordinator and forager payoffs for every row of coins, in one pass.
+
+    - coins: coins collected per forager, shape (..., n_foragers), e.g.
+      (trials, foragers). Any number of foragers (at least one) is accepted.
+    - overhead, wages and investment broadcast against coins.shape[:-1], so a
+      parameter sweep is e.g. coins[None] with overhead[:, None].
+    - Each step truncates like the scalar rules in WealthTracker:
+      - coordinator = int(overhead * n + int(E - investment * E))
+      - remaining = n - int(overhead * n)
+      - salaries = int(remaining * wages), or 0 if below the number of foragers
+      - salary = int(salaries / n_foragers)
+      - commission_i = int(coins_i / n * (remaining - salaries))
+      where n is the total coins and E is COORDINATOR_INITIAL_ENDOWMENT.
+    """
+    coins = np.asarray(coins, dtype=np.int64)
+    assert coins.ndim >= 1 and coins.shape[-1] > 0, f"Error: expected coins of shape (..., n_foragers), but got {coins.shape}"
+    n_foragers = coins.shape[-1]
+    n_coins = coins.sum(axis=-1)
+    overhead = np.asarray(overhead, dtype=float)
+    wages = np.asarray(wages, dtype=float)
+    investment = np.asarray(investment, dtype=float)
+
+    kept_endowment = _truncate(COORDINATOR_INITIAL_ENDOWMENT - investment * COORDINATOR_INITIAL_ENDOWMENT)
+    coordinator = _truncate(overhead * n_coins + kept_endowment)
+
+    remaining = n_coins - _truncate(overhead * n_coins)
+    for_salaries = _truncate(remaining * wages)
+    for_salaries = np.where(for_salaries < n_foragers, 0, for_salaries)
+    salary = _truncate(for_salaries / n_foragers)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        proportions = coins / n_coins[..., None]
+    proportions = np.where(n_coins[..., None] == 0, 0.0, proportions)
+    commissions = _truncate(proportions * (remaining - for_salaries)[..., None])
+
+    return RewardBreakdown(
+        n_coins=n_coins,
+        remaining=remaining,
+        salary=salary,
+        commissions=commissions,
+        coordinator=coordinator,
+        foragers=salary[..., None] + commissions,
+    )
 
 
 class WealthTracker:
-    """Keeps track of the coins throughout iterations"""
+    """Keeps track of the coins throughout iterations (one allocation of batch_rewards)"""
 
     def __init__(self, coins:List[int]=INITIAL_WEALTH) -> None:
         for f_coins in coins:
             assert(isinstance(f_coins, int))
-        assert(len(coins) == NUM_FORAGERS)
+        assert(len(coins) > 0), "Error: expected the coins of at least one forager"
         self.coins = coins
         self.n_coins = sum(coins)
         self.coordinator_reward: Union[float, None] = None
         self.foragers_rewards: Union[List[float], None] = None
 
     def initialize(self, sliders: Dict[str, float], investment:float) -> None:
+        # Coordinator's and foragers' wealth in one pass
+        breakdown = self._breakdown(sliders, investment)
+        self.coordinator_reward = int(breakdown.coordinator)
+        self.foragers_rewards = breakdown.foragers.tolist()
 
-        # print("Number of coins: ", self.n_coins)
-
-        # Calculate coordinator's wealth
-        self.calculate_coordinator_reward(sliders, investment)
-        # print("Coordinator reward: ", self.get_coordinator_reward())
-
-        # Calculate foragers' breakdown
-        remaining, wages, forager_commissions = self.get_foragers_breakdown(sliders)
-        # print("Remaining after overhead:", remaining)
-        # print("Wages:", wages)
-        # print("Forager commissions:", forager_commissions)
-
-        foragers_rewards = wages + np.array(forager_commissions)
-        self.foragers_rewards = foragers_rewards.tolist()
-        # print("Foragers rewards:", self.foragers_rewards)
+    def _breakdown(self, sliders: Dict[str, float], investment:float) -> RewardBreakdown:
+        # Get slider parameters
+        overhead = self._overhead(sliders)
+        assert isinstance(overhead, float), f"Error: Expected overhead of type float, got {type(overhead)} --- {overhead=}"
+        return batch_rewards(self.coins, overhead, sliders["wages"], investment)
 
-        # logger.info(f"Foragers rewards: {self.foragers_rewards}")
+    @staticmethod
+    def _overhead(sliders: Dict[str, float]) -> float:
+        overhead = sliders["overhead"]
+        if isinstance(overhead, tuple):
+            overhead = overhead[0]
+        return overhead
 
     def get_foragers_breakdown(self, sliders) -> Tuple[int, int, List[int]]:
-        overhead = sliders["overhead"]
+        overhead = self._overhead(sliders)
         logger.info(f"Overhead: {overhead} --- n_coins: {self.n_coins}")
-        remaining = self.n_coins - int(overhead * self.n_coins)
-
-        for_salaries = int(remaining * sliders["wages"])
-        if for_salaries < NUM_FORAGERS:
-            for_salaries = 0
-        # print("= for salaries:", for_salaries)
-        salary = int(for_salaries / NUM_FORAGERS)
-
-        if self.n_coins == 0:
-            forager_proportions = np.zeros(NUM_FORAGERS)
-        else:
-            forager_proportions = np.array(self.coins) / self.n_coins
-        # print("remaining - for salaries:", remaining - for_salaries)
-        forager_commissions = forager_proportions * (remaining - for_salaries)
-        forager_commissions = [int(commission) for commission in forager_commissions]
-
-        return int(remaining), int(salary), forager_commissions
+        breakdown = batch_rewards(self.coins, overhead, sliders["wages"], 0.0)
+        return int(breakdown.remaining), int(breakdown.salary), breakdown.commissions.tolist()
 
     def calculate_coordinator_reward(self, sliders: Dict[str, float], investment:float) -> None:
-        # Get slider parameters
-        overhead = sliders["overhead"]
-        if isinstance(overhead, tuple):
-            overhead = overhead[0]
-        assert isinstance(overhead, float), f"Error: Expected overhead of type float, got {type(overhead)} --- {overhead=}"
-        coordinator_reward = overhead * self.n_coins + int(COORDINATOR_ENDOWMENT - investment * COORDINATOR_ENDOWMENT)
-        self.coordinator_reward = int(coordinator_reward)
+        self.coordinator_reward = int(self._breakdown(sliders, investment).coordinator)
 
     def get_coordinator_reward(self) -> float:
         assert(self.coordinator_reward is not None), "Coordinator wealth is not set yet. Run update() first."
@@ -800,7 +1586,7 @@ class RewardProcessing:
         investment: float,
         trial_type: str
     ) -> float:
-        trial_types = ["coordinator"] + [f"forager-{i}" for i in range(NUM_FORAGERS)]
+        trial_types = ["coordinator"] + [f"forager-{i}" for i in range(len(coins))]
         assert(trial_type in trial_types), f"Invalid trial type. Expected one of {trial_types} but got {trial_type}."
 
         accumulated_wealth = WealthTracker(coins)
@@ -854,7 +1640,7 @@ class RewardProcessing:
         reward_text += f"<p>How was your score obtained?</p>"
 
         if trial_type.startswith("coordinator"):
-            remaining = COORDINATOR_ENDOWMENT - int(investment * COORDINATOR_ENDOWMENT)
+            remaining = COORDINATOR_INITIAL_ENDOWMENT - int(investment * COORDINATOR_INITIAL_ENDOWMENT)
             reward_text += f"""
         <br>
         <p>
@@ -0,0 +1,242 @@
+# Module with the process-wide cache of parsed maps
+import os
+import sys
+import json
+import hashlib
+import threading
+import numpy as np
+
+from pathlib import Path
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from numpy.typing import NDArray
+from typing import Dict, Tuple, List, Iterable, Union
+
+try:
+    # Assume running from psynet
+    from .game_parameters import (
+        WORLD_WIDTH,
+        WORLD_HEIGHT,
+        WORLD_PATHS,
+    )
+except:
+    # If not, try normal import
+    from game_parameters import (
+        WORLD_WIDTH,
+        WORLD_HEIGHT,
+        WORLD_PATHS,
+    )
+
+Pos = Tuple[int, int]  # (x, y)
+
+# Binary maps: a 16-byte little-endian header followed by n_coins (x, y) int16
+# pairs in the order of the JSON file they were converted from
+BINARY_MAP_SUFFIX = ".cmap"
+BINARY_MAP_MAGIC = b"CMAP"
+BINARY_MAP_VERSION = 1
+BINARY_MAP_HEADER = np.dtype([
+    ("magic", "S4"),
+    ("version", "<u2"),
+    ("width", "<u2"),
+    ("height", "<u2"),
+    ("reserved", "<u2"),
+    ("n_coins", "<u4"),
+])
+
+
+@dataclass(frozen=True)
+class MapEntry:
+    """
+    One parsed map file.
+
+    - coins: read-only (n, 2) int16 array of (x, y), in file order.
+    - packed_grid: read-only np.packbits of the (HEIGHT, WIDTH) coin mask,
+      keeping only the coins that fall inside the grid. Binary maps carry
+      their own size, JSON maps use WORLD_HEIGHT and WORLD_WIDTH.
+    - digest: blake2b of the file contents the entry was parsed from.
+    """
+    path: str
+    digest: str
+    coins: NDArray[np.int16] = field(repr=False)
+    packed_grid: NDArray[np.uint8] = field(repr=False)
+    shape: Tuple[int, int] = (WORLD_HEIGHT, WORLD_WIDTH)
+
+    @property
+    def nbytes(self) -> int:
+        return self.coins.nbytes + self.packed_grid.nbytes
+
+    def grid(self) -> NDArray[np.bool_]:
+        """Fresh boolean coin mask of shape (HEIGHT, WIDTH)."""
+        n_cells = self.shape[0] * self.shape[1]
+        return np.unpackbits(self.packed_grid, count=n_cells).astype(bool).reshape(self.shape)
+
+    def coin_list(self) -> List[Pos]:
+        """Coins as a list of (x, y) tuples, as they would come from json.load."""
+        return [tuple(coin) for coin in self.coins.tolist()]
+
+
+def _check_header(header: np.void, path: Union[str, Path], size: int) -> None:
+    if header["magic"] != BINARY_MAP_MAGIC:
+        raise ValueError(f"{path} is not a binary map (magic {header['magic']!r})")
+    if header["version"] != BINARY_MAP_VERSION:
+        raise ValueError(f"{path} has binary map version {header['version']}, expected {BINARY_MAP_VERSION}")
+    expected = BINARY_MAP_HEADER.itemsize + 4 * int(header["n_coins"])
+    if size != expected:
+        raise ValueError(f"{path} has {size} bytes, expected {expected} for {header['n_coins']} coins")
+
+
+def write_binary_map(path: Union[str, Path], coins: NDArray, width: int = WORLD_WIDTH, height: int = WORLD_HEIGHT) -> None:
+    """Save coins ((n, 2) array of (x, y)) as a binary map."""
+    coins = np.asarray(coins, dtype=np.int64).reshape(-1, 2)
+    if coins.size and (coins.min() < np.iinfo(np.int16).min or coins.max() > np.iinfo(np.int16).max):
+        raise ValueError("coin coordinates do not fit in int16")
+    header = np.zeros(1, dtype=BINARY_MAP_HEADER)
+    header["magic"] = BINARY_MAP_MAGIC
+    header["version"] = BINARY_MAP_VERSION
+    header["width"] = width
+    header["height"] = height
+    header["n_coins"] = len(coins)
+    with open(path, "wb") as f:
+        f.write(header.tobytes())
+        f.write(coins.astype("<i2").tobytes())
+
+
+def read_binary_map(path: Union[str, Path]) -> Tuple[NDArray[np.int16], int, int]:
+    """Memory-mapped (n, 2) coins of a binary map, with the map's width and height.
+
+    Nothing is read until the coins are used, so opening many maps costs one
+    small read per header.
+    """
+    header = np.fromfile(path, dtype=BINARY_MAP_HEADER, count=1)
+    if len(header) == 0:
+        raise ValueError(f"{path} is too short to be a binary map")
+    header = header[0]
+    _check_header(header, path, os.path.getsize(path))
+    n_coins = int(header["n_coins"])
+    if n_coins == 0:
+        coins = np.zeros((0, 2), dtype=np.int16)
+    else:
+        coins = np.memmap(path, dtype="<i2", mode="r", offset=BINARY_MAP_HEADER.itemsize, shape=(n_coins, 2))
+    return coins, int(header["width"]), int(header["height"])
+
+
+def convert_json_map(json_path: Union[str, Path], binary_path: Union[str, Path, None] = None) -> Path:
+    """Write the binary version of a JSON map, next to it by default."""
+    json_path = Path(json_path)
+    binary_path = json_path.with_suffix(BINARY_MAP_SUFFIX) if binary_path is None else Path(binary_path)
+    with open(json_path, "r") as f:
+        coins = json.load(f)
+    write_binary_map(binary_path, np.array(coins, dtype=np.int64).reshape(-1, 2))
+    return binary_path
+
+
+def parse_map(path: str, data: bytes, digest: str) -> MapEntry:
+    """Entry for the contents of a JSON or, by suffix, binary map file."""
+    shape = (WORLD_HEIGHT, WORLD_WIDTH)
+    if path.endswith(BINARY_MAP_SUFFIX):
+        header = np.frombuffer(data, dtype=BINARY_MAP_HEADER, count=1)[0]
+        _check_header(header, path, len(data))
+        coins = np.frombuffer(data, dtype="<i2", offset=BINARY_MAP_HEADER.itemsize).reshape(-1, 2).astype(np.int16)
+        shape = (int(header["height"]), int(header["width"]))
+    else:
+        coins = np.array(json.loads(data), dtype=np.int16).reshape(-1, 2)
+    height, width = shape
+    xs, ys = coins[:, 0].astype(np.int64), coins[:, 1].astype(np.int64)
+    inside = (xs >= 0) & (xs < width) & (ys >= 0) & (ys < height)
+    mask = np.zeros(shape, dtype=bool)
+    mask[ys[inside], xs[inside]] = True
+    packed_grid = np.packbits(mask)
+    coins.flags.writeable = False
+    packed_grid.flags.writeable = False
+    return MapEntry(path=path, digest=digest, coins=coins, packed_grid=packed_grid, shape=shape)
+
+
+class MapRegistry:
+    """
+    LRU cache of parsed maps, shared by everything in the process.
+
+    - Entries are keyed by (path, content digest): editing a file gives a new
+      digest, so the stale entry is dropped and the file parsed again.
+    - Files are only re-read and re-hashed when their stat (mtime, size, inode)
+      changes; otherwise a lookup is a dictionary hit.
+    - At most max_entries entries and max_bytes bytes of arrays are kept; the
+      least recently used ones are evicted first.
+    - Entries hold read-only arrays, so they can be handed out without copies.
+    """
+
+    def __init__(self, max_entries: int = 64, max_bytes: int = 64 * 2 ** 20) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[str, str], MapEntry]" = OrderedDict()
+        self._stats: Dict[str, Tuple[Tuple[int, int, int], str]] = {}
+        self._nbytes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(path: Union[str, Path]) -> str:
+        return os.path.normpath(os.fspath(path))
+
+    def get(self, path: Union[str, Path]) -> MapEntry:
+        """Parsed map at path, read from disk only if it is new or has changed."""
+        key = self._key(path)
+        stat = os.stat(key)
+        signature = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        with self._lock:
+            known = self._stats.get(key)
+            if known is not None and known[0] == signature:
+                entry = self._entries.get((key, known[1]))
+                if entry is not None:
+                    self._entries.move_to_end((key, known[1]))
+                    return entry
+
+        with open(key, "rb") as f:
+            data = f.read()
+        digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+
+        with self._lock:
+            entry = self._entries.get((key, digest))
+            if entry is None:
+                entry = parse_map(key, data, digest)
+                # Only the latest version of a file is kept
+                if known is not None and known[1] != digest:
+                    self._discard((key, known[1]))
+                self._entries[(key, digest)] = entry
+                self._nbytes += entry.nbytes
+                self._evict()
+            self._entries.move_to_end((key, digest))
+            self._stats[key] = (signature, digest)
+            return entry
+
+    def preload(self, paths: Iterable[Union[str, Path]] = WORLD_PATHS) -> None:
+        for path in paths:
+            self.get(path)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._stats.clear()
+            self._nbytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _discard(self, entry_key: Tuple[str, str]) -> None:
+        entry = self._entries.pop(entry_key, None)
+        if entry is not None:
+            self._nbytes -= entry.nbytes
+
+    def _evict(self) -> None:
+        while len(self._entries) > 1 and (len(self._entries) > self.max_entries or self._nbytes > self.max_bytes):
+            (path, digest), entry = self._entries.popitem(last=False)
+            self._nbytes -= entry.nbytes
+            if self._stats.get(path, (None, None))[1] == digest:
+                del self._stats[path]
+
+
+MAPS = MapRegistry()
+
+
+if __name__ == "__main__":
+    # python map_registry.py static/map*.json
+    for json_path in sys.argv[1:]:
+        print(f"{json_path} -> {convert_json_map(json_path)}")
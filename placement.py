@@ -0,0 +1,199 @@
+# Module with the forager placement solver (automatic coordinator)
+import threading
+import numpy as np
+
+from pathlib import Path
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from numpy.typing import NDArray
+from typing import Dict, List, Tuple, Iterable, Optional, Union
+
+try:
+    # Assume running from psynet
+    from .helper_classes import World, ForagerBot, WindowCounts, as_coords
+    from .map_registry import MAPS
+    from .game_parameters import (
+        NUM_FORAGERS,
+        COLLECTION_CHANCE,
+    )
+except:
+    # If not, try normal import
+    from helper_classes import World, ForagerBot, WindowCounts, as_coords
+    from map_registry import MAPS
+    from game_parameters import (
+        NUM_FORAGERS,
+        COLLECTION_CHANCE,
+    )
+
+Pos = Tuple[int, int]  # (x, y)
+
+# Gear assumed for foragers whose gear is not known when they are placed.
+# Gear only weights coverage by COLLECTION_CHANCE(gear); what a forager covers
+# does not depend on it (see VIEW_RADIUS).
+DEFAULT_GEAR = 1
+
+# A forager covers the coins it sees from its start: the 11 x 11 window of the
+# foraging page, i.e. ForagerBot.sight_radius around it, the same in every
+# gear. A gear's own 3x3/5x5/7x7 window is only how far one click moves.
+VIEW_RADIUS = ForagerBot.sight_radius
+
+
+def in_view(coins: NDArray, x: int, y: int) -> NDArray[np.bool_]:
+    """Which of the (n, 2) coins a forager at (x, y) sees (see VIEW_RADIUS)."""
+    return np.maximum(np.abs(coins[:, 0] - x), np.abs(coins[:, 1] - y)) <= VIEW_RADIUS
+
+
+def coverage_map(world: World, gear: int) -> NDArray[np.float64]:
+    """Expected coins collected from each start cell, shape (HEIGHT, WIDTH).
+
+    Coins in view of the cell (see VIEW_RADIUS), weighted by COLLECTION_CHANCE(gear).
+    """
+    ys, xs = np.mgrid[0:world.height, 0:world.width]
+    return COLLECTION_CHANCE(gear) * world.window_counts().square(xs, ys, VIEW_RADIUS)
+
+
+@dataclass
+class Placement:
+    """
+    Start positions proposed for the foragers.
+
+    - positions: (k, 2) array of (x, y), in the order they were chosen.
+    - covered: coins in view of at least one forager (fixed ones included).
+    - expected_coins: covered weighted by COLLECTION_CHANCE(gear).
+    """
+    positions: NDArray[np.int64] = field(repr=False)
+    gear: int
+    covered: int
+    expected_coins: float
+
+    def position_list(self) -> List[Pos]:
+        return list(map(tuple, self.positions.tolist()))
+
+
+def place_foragers(
+    world: World,
+    k: int = NUM_FORAGERS,
+    gear: int = DEFAULT_GEAR,
+    fixed: Optional[Union[List[Pos], NDArray]] = None,
+) -> Placement:
+    """
+    Greedy start positions for k foragers that together cover as many coins as possible.
+
+    - Each forager covers the coins in view of its start (see VIEW_RADIUS), and
+      a coin covered twice counts once. Coverage is submodular, so picking the
+      start that covers the most uncovered coins, k times, is within 1 - 1/e
+      of the best placement.
+    - Gains of every cell are read at once from window counts (see
+      WindowCounts) of the uncovered coins, updated in place after each pick.
+    - Ties go to the smallest (y, x), so the result is deterministic.
+    - fixed: foragers already placed; their coins count as covered first.
+    - Once every coin is covered, the remaining foragers go to the free cells
+      with the most coins in view, one forager per cell.
+    """
+    assert k >= 0, f"Error: number of foragers should be non-negative, but got {k}"
+    coins = world.coins()
+    uncovered = np.ones(len(coins), dtype=bool)
+    counts = WindowCounts(world.grid)
+    ys, xs = np.mgrid[0:world.height, 0:world.width]
+
+    # Cells holding a forager, fixed or placed
+    taken = np.zeros(world.height * world.width, dtype=bool)
+    # Coins in view of each cell before any is covered, to rank cells once gains run out
+    in_view_counts = counts.square(xs, ys, VIEW_RADIUS).ravel()
+
+    def cover(x: int, y: int) -> None:
+        reached = uncovered & in_view(coins, x, y)
+        counts.remove_many(coins[reached, 0], coins[reached, 1])
+        uncovered[reached] = False
+        taken[y * world.width + x] = True
+
+    if fixed is not None:
+        for x, y in as_coords(fixed).tolist():
+            cover(x, y)
+
+    positions = np.zeros((k, 2), dtype=np.int64)
+    n_placed = 0
+    while n_placed < k:
+        gains = counts.square(xs, ys, VIEW_RADIUS)
+        cell = int(np.argmax(gains))
+        if gains.flat[cell] == 0:
+            # Every coin is covered: argmax would only stack foragers on cell 0
+            break
+        positions[n_placed] = cell % world.width, cell // world.width
+        cover(*positions[n_placed].tolist())
+        n_placed += 1
+
+    if n_placed < k:
+        # Stable sort, so ties still go to the smallest (y, x)
+        ranked = np.argsort(-in_view_counts, kind="stable")
+        free = ranked[~taken[ranked]][:k - n_placed]
+        assert len(free) == k - n_placed, f"Error: {k} foragers do not fit on the {len(free) + n_placed} free cells"
+        positions[n_placed:, 0] = free % world.width
+        positions[n_placed:, 1] = free // world.width
+
+    covered = int(len(coins) - uncovered.sum())
+    return Placement(
+        positions=positions,
+        gear=gear,
+        covered=covered,
+        expected_coins=covered * COLLECTION_CHANCE(gear),
+    )
+
+
+class PlacementCache:
+    """
+    Placements per map, number of foragers, gear and fixed foragers, computed once per process.
+
+    - Keyed by the map's content digest (see map_registry), so an edited map
+      is solved again.
+    - Fixed foragers (see place_foragers) are part of the key, in any order.
+    - At most max_entries placements are kept, least recently used evicted first.
+    """
+
+    def __init__(self, max_entries: int = 256) -> None:
+        self.max_entries = max_entries
+        self._placements: "OrderedDict[tuple, Placement]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        map_path: Union[str, Path],
+        k: int = NUM_FORAGERS,
+        gear: int = DEFAULT_GEAR,
+        fixed: Union[Iterable[Pos], NDArray] = (),
+    ) -> Placement:
+        fixed = tuple(sorted(map(tuple, as_coords(fixed).tolist())))
+        key = (MAPS.get(map_path).digest, k, gear, fixed)
+        with self._lock:
+            placement = self._placements.get(key)
+            if placement is not None:
+                self._placements.move_to_end(key)
+                return placement
+        placement = place_foragers(World.generate_from_json(map_path), k, gear, fixed)
+        placement.positions.flags.writeable = False
+        with self._lock:
+            self._placements[key] = placement
+            while len(self._placements) > self.max_entries:
+                self._placements.popitem(last=False)
+        return placement
+
+    def clear(self) -> None:
+        with self._lock:
+            self._placements.clear()
+
+    def __len__(self) -> int:
+        return len(self._placements)
+
+
+PLACEMENTS = PlacementCache()
+
+
+def automatic_placements(
+    map_path: Union[str, Path],
+    forager_ids: Iterable[str] = tuple(str(i) for i in range(NUM_FORAGERS)),
+    gear: int = DEFAULT_GEAR,
+) -> Dict[str, Pos]:
+    """Positions per forager id, as the answer of a coordinator page (e.g. for the "rlagent" role)."""
+    forager_ids = list(forager_ids)
+    positions = PLACEMENTS.get(map_path, len(forager_ids), gear).position_list()
+    return dict(zip(forager_ids, positions))
@@ -0,0 +1,58 @@
+# Module with the random number streams used throughout the experiment
+import hashlib
+import numpy as np
+
+from pathlib import Path
+from typing import List, Any
+
+try:
+    # Assume running from psynet
+    from .game_parameters import ROOT_SEED
+except:
+    # If not, try normal import
+    from game_parameters import ROOT_SEED
+
+
+def stable_key(key: Any) -> int:
+    """64-bit integer for key that is identical across processes and runs (unlike hash())."""
+    if isinstance(key, Path):
+        key = key.as_posix()
+    elif isinstance(key, np.generic):
+        key = key.item()
+    digest = hashlib.blake2b(repr(key).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+class SeedStreams:
+    """
+    Tree of independent random streams rooted at a single seed.
+
+    - Streams are addressed by keys, e.g. ("trial", node_id, participant_id),
+      ("world", map_path) or ("bot", world_key, forager_id).
+    - The same keys always give the same stream, whatever the order in which
+      streams are requested, so each thread or process can build its own
+      Generator and results stay reproducible.
+    - Keyed streams are the children SeedSequence.spawn would produce, with the
+      spawn index replaced by a stable hash of each key.
+    """
+
+    def __init__(self, root_seed: int = ROOT_SEED) -> None:
+        self.root = np.random.SeedSequence(root_seed)
+
+    def sequence(self, *keys: Any) -> np.random.SeedSequence:
+        return np.random.SeedSequence(
+            self.root.entropy,
+            spawn_key=self.root.spawn_key + tuple(stable_key(key) for key in keys),
+            pool_size=self.root.pool_size,
+        )
+
+    def rng(self, *keys: Any) -> np.random.Generator:
+        """Fresh Generator for the stream addressed by keys."""
+        return np.random.default_rng(self.sequence(*keys))
+
+    def spawn(self, n: int, *keys: Any) -> List[np.random.SeedSequence]:
+        """n independent child sequences of the stream addressed by keys (e.g. one per worker)."""
+        return self.sequence(*keys).spawn(n)
+
+
+SEEDS = SeedStreams()
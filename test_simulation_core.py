@@ -0,0 +1,621 @@
+# Tests for the simulation core, runnable without psynet:
+#
+#   python -m pytest -q test_simulation_core.py
+#
+# The incremental data structures (coin indices, window counts) are checked
+# against brute-force references on random grids, the vectorized kernels
+# against the scalar code they replaced.
+import json
+import os
+import shutil
+import subprocess
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from pathlib import Path
+
+try:
+    # Assume running from psynet
+    from .helper_classes import (
+        CoinIndex,
+        CoinOverlay,
+        DistanceTransform,
+        ForagerBot,
+        WindowCounts,
+        WealthTracker,
+        World,
+        batch_rewards,
+        closest_coin,
+        find_coins,
+        zigzag_path,
+    )
+    from .batch_simulation import BatchForagerSimulation
+    from .grid_encoding import encode_terrain, decode_grid, terrain_noise
+    from .map_registry import (
+        MAPS,
+        MapRegistry,
+        convert_json_map,
+        read_binary_map,
+        write_binary_map,
+    )
+    from .placement import VIEW_RADIUS, PlacementCache, place_foragers
+    from .game_parameters import COORDINATOR_INITIAL_ENDOWMENT, MAX_MOVEMENT
+except ImportError:
+    # If not, try normal import
+    from helper_classes import (
+        CoinIndex,
+        CoinOverlay,
+        DistanceTransform,
+        ForagerBot,
+        WindowCounts,
+        WealthTracker,
+        World,
+        batch_rewards,
+        closest_coin,
+        find_coins,
+        zigzag_path,
+    )
+    from batch_simulation import BatchForagerSimulation
+    from grid_encoding import encode_terrain, decode_grid, terrain_noise
+    from map_registry import (
+        MAPS,
+        MapRegistry,
+        convert_json_map,
+        read_binary_map,
+        write_binary_map,
+    )
+    from placement import VIEW_RADIUS, PlacementCache, place_foragers
+    from game_parameters import COORDINATOR_INITIAL_ENDOWMENT, MAX_MOVEMENT
+
+SHAPES = [(1, 1), (1, 9), (7, 1), (13, 29), (40, 40)]
+DENSITIES = [0.02, 0.2]
+MAP_PATH = Path(__file__).parent / "static" / "map0.json"
+
+
+def random_grid(rng: np.random.Generator, shape, density: float) -> np.ndarray:
+    return (rng.random(shape) < density).astype(np.int8)
+
+
+def expected_nearest(pos, coins_xy, max_distance=None):
+    """Reference answer: closest_coin, or None beyond max_distance."""
+    best = closest_coin(pos, coins_xy)
+    if best is None or max_distance is None:
+        return best
+    return best if abs(best[0] - pos[0]) + abs(best[1] - pos[1]) <= max_distance else None
+
+
+def removal_order(rng: np.random.Generator, grid: np.ndarray) -> np.ndarray:
+    coins = find_coins(grid)
+    return coins[rng.permutation(len(coins))]
+
+
+def brute_force_counts(grid, xs, ys, radius, shape):
+    """Coins in the square or diamond window of radius around each (x, y)."""
+    cy, cx = np.nonzero(grid)
+    dx = np.abs(cx - xs[..., None])
+    dy = np.abs(cy - ys[..., None])
+    inside = np.maximum(dx, dy) <= radius if shape == "square" else dx + dy <= radius
+    return inside.sum(axis=-1)
+
+
+# ---------------------------------------------------------------------------
+# Coin indices
+# ---------------------------------------------------------------------------
+@pytest.mark.parametrize("index_class", [DistanceTransform, CoinIndex])
+@pytest.mark.parametrize("shape", SHAPES)
+@pytest.mark.parametrize("density", DENSITIES)
+def test_index_matches_closest_coin_while_removing(index_class, shape, density):
+    rng = np.random.default_rng([shape[0], shape[1], int(density * 100)])
+    grid = random_grid(rng, shape, density)
+    index = index_class(grid)
+    queries = np.stack(np.nonzero(np.ones(shape)), axis=1)[:, ::-1]
+    for coin in removal_order(rng, grid).tolist() + [None]:
+        remaining = find_coins(grid)
+        assert index.count == len(remaining)
+        for pos in queries[rng.choice(len(queries), size=min(25, len(queries)), replace=False)].tolist():
+            for max_distance in [None, 0, 3]:
+                assert index.nearest(tuple(pos), max_distance) == expected_nearest(pos, remaining, max_distance)
+        xs, ys = queries[:, 0], queries[:, 1]
+        assert np.array_equal(index.has_coin(xs, ys), grid[ys, xs] == 1)
+        if coin is not None:
+            index.remove(tuple(coin))
+            grid[coin[1], coin[0]] = 0
+
+
+def test_distance_transform_remove_matches_rebuild():
+    rng = np.random.default_rng(5)
+    grid = random_grid(rng, (30, 50), 0.05)
+    transform = DistanceTransform(grid)
+    for coin in removal_order(rng, grid).tolist():
+        transform.remove(tuple(coin))
+        grid[coin[1], coin[0]] = 0
+        assert np.array_equal(transform.keys, DistanceTransform(grid).keys)
+
+
+@pytest.mark.parametrize("shape", SHAPES)
+def test_overlay_matches_closest_coin_and_leaves_base_untouched(shape):
+    rng = np.random.default_rng(shape)
+    grid = random_grid(rng, shape, 0.2)
+    base = DistanceTransform(grid)
+    keys = base.keys.copy()
+    overlay = CoinOverlay(base)
+    queries = np.stack(np.nonzero(np.ones(shape)), axis=1)[:, ::-1]
+    for coin in removal_order(rng, grid).tolist():
+        overlay.remove(tuple(coin))
+        grid[coin[1], coin[0]] = 0
+        remaining = find_coins(grid)
+        assert overlay.count == len(remaining)
+        for pos in queries[rng.choice(len(queries), size=min(25, len(queries)), replace=False)].tolist():
+            for max_distance in [None, 2]:
+                assert overlay.nearest(tuple(pos), max_distance) == expected_nearest(pos, remaining, max_distance)
+    assert np.array_equal(base.keys, keys)
+
+
+def test_overlay_copies_are_independent():
+    grid = np.zeros((5, 5), dtype=np.int8)
+    grid[2, 2] = grid[0, 0] = 1
+    overlay = CoinOverlay(DistanceTransform(grid))
+    duplicate = overlay.copy()
+    duplicate.remove((2, 2))
+    assert (2, 2) in overlay and (2, 2) not in duplicate
+    assert overlay.nearest((3, 3)) == (2, 2)
+    assert duplicate.nearest((3, 3)) == (0, 0)
+
+
+# ---------------------------------------------------------------------------
+# Window counts
+# ---------------------------------------------------------------------------
+@pytest.mark.parametrize("shape", SHAPES)
+def test_window_counts_match_brute_force_while_removing(shape):
+    rng = np.random.default_rng(shape)
+    grid = random_grid(rng, shape, 0.3).astype(bool)
+    counts = WindowCounts(grid)
+    # Include cells off the grid, whose windows are clipped
+    ys, xs = np.mgrid[-3:shape[0] + 3, -3:shape[1] + 3]
+    coins = removal_order(rng, grid)
+    batches = [coins[:1], coins[1:3], coins[3:40], coins[40:]]
+    for batch in batches + [coins[:0]]:
+        for radius in [0, 1, 3, 100]:
+            for window in ["square", "diamond"]:
+                got = getattr(counts, window)(xs, ys, radius)
+                assert np.array_equal(got, brute_force_counts(grid, xs, ys, radius, window))
+        assert counts.count == grid.sum()
+        counts.remove_many(batch[:, 0], batch[:, 1])
+        grid[batch[:, 1], batch[:, 0]] = False
+
+
+# ---------------------------------------------------------------------------
+# Walks
+# ---------------------------------------------------------------------------
+def reference_walk(start, target):
+    """The cell-by-cell walk zigzag_path replaced."""
+    pos = start
+    axis = "x" if abs(target[0] - pos[0]) > 0 else "y"
+    path = []
+    while pos != target:
+        x, y = pos
+        if axis == "x" and x != target[0]:
+            x += 1 if target[0] > x else -1
+        elif axis == "y" and y != target[1]:
+            y += 1 if target[1] > y else -1
+        pos = (x, y)
+        path.append(pos)
+        axis = "y" if axis == "x" else "x"
+    return path
+
+
+def test_zigzag_path_matches_reference_walk():
+    for dx in range(-6, 7):
+        for dy in range(-6, 7):
+            start, target = (10, 10), (10 + dx, 10 + dy)
+            xs, ys = zigzag_path(start, target)
+            assert list(zip(xs.tolist(), ys.tolist())) == reference_walk(start, target)
+
+
+@pytest.mark.parametrize("fuel_steps", [0, 1, 2, 7, 40])
+def test_bot_never_walks_past_its_fuel(fuel_steps):
+    grid = np.zeros((20, 20), dtype=np.int8)
+    grid[4, 8] = grid[15, 2] = 1
+    bot = ForagerBot(grid, (5, 5), max_speed=1, rng=np.random.default_rng(0))
+    visited = bot.run(fuel_steps=fuel_steps)
+    # The start tile is always recorded
+    assert len(visited) <= max(fuel_steps, 1)
+
+
+def test_bot_on_overlay_matches_bot_on_own_grid():
+    rng = np.random.default_rng(3)
+    grid = random_grid(rng, (40, 40), 0.05)
+    frozen = grid.copy()
+    frozen.flags.writeable = False
+    for seed in range(5):
+        own = ForagerBot(grid.copy(), (20, 20), max_speed=2, rng=np.random.default_rng(seed))
+        shared = ForagerBot(
+            frozen, (20, 20), max_speed=2, rng=np.random.default_rng(seed),
+            coins=CoinOverlay(DistanceTransform(frozen)),
+        )
+        assert np.array_equal(own.run(fuel_steps=150), shared.run(fuel_steps=150))
+        assert np.array_equal(own.collected, shared.collected)
+
+
+def test_bot_collect_without_rng_draws_a_new_stream_per_call():
+    map_path = Path(__file__).parent / "static" / "map0.json"
+    runs = [len(World.generate_from_json(map_path).bot_collect(None, (65, 22), 2)[0]) for _ in range(2)]
+    world = World.generate_from_json(map_path)
+    repeated = [len(world.bot_collect(None, (65, 22), 2)[0]) for _ in range(4)]
+    # Reproducible from the world's stream, but not the same run every call
+    assert repeated[0] == runs[0] == runs[1]
+    assert len(set(repeated)) > 1
+
+
+def test_one_world_evaluated_from_several_threads():
+    rng = np.random.default_rng(4)
+    ys, xs = np.nonzero(random_grid(rng, (World.height, World.width), 0.05))
+    world = World.generate_from_array(np.stack([xs, ys], axis=1))
+    positions = [(10, 10), (30, 20)]
+
+    def run(seed):
+        return world.reward_from_bots(positions, 2, rng=np.random.default_rng(seed))[0]
+
+    expected = [World.generate_from_array(world.coins()).reward_from_bots(
+        positions, 2, rng=np.random.default_rng(seed))[0] for seed in range(8)]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        assert list(pool.map(run, range(8))) == expected
+        # Without an rng, each call draws its own stream from the world's
+        list(pool.map(lambda _: world.reward_from_bots(positions, 2), range(8)))
+    assert len(world.coins()) == len(xs)
+
+
+# ---------------------------------------------------------------------------
+# Batch simulation
+# ---------------------------------------------------------------------------
+@pytest.mark.parametrize("gear", [1, 2, 3])
+def test_batch_simulation_matches_forager_bot_on_average(gear):
+    grid = MAPS.get(MAP_PATH).grid()
+    n_runs = 150
+    scalar = np.zeros(n_runs)
+    for seed in range(n_runs):
+        bot = ForagerBot(grid.copy(), (65, 22), gear, rng=np.random.default_rng(seed), record="none")
+        bot.run(fuel_steps=MAX_MOVEMENT(gear), max_turns=MAX_MOVEMENT(gear))
+        scalar[seed] = bot.n_collected
+    batch = BatchForagerSimulation(grid, [(65, 22)] * n_runs, gear, seeds=np.arange(n_runs)).run().coins_collected
+    # The random streams differ, so only the distributions can be compared
+    standard_error = np.sqrt((scalar.var(ddof=1) + batch.var(ddof=1)) / n_runs)
+    assert abs(scalar.mean() - batch.mean()) < 4 * standard_error
+
+
+def test_batch_bot_depends_only_on_its_own_seed():
+    grid = MAPS.get(MAP_PATH).grid()
+    starts, speeds, seeds = [(65, 22), (10, 10), (40, 60), (79, 0)], [1, 2, 3, 2], [5, 6, 7, 8]
+    together = BatchForagerSimulation(grid, starts, speeds, seeds=seeds, record=True).run()
+    for b in range(len(starts)):
+        alone = BatchForagerSimulation(grid, starts[b:b + 1], speeds[b], seeds=seeds[b:b + 1], record=True).run()
+        assert together.coins_collected[b] == alone.coins_collected[0]
+        assert np.array_equal(together.trajectories[b], alone.trajectories[0])
+
+
+@pytest.mark.parametrize("gear", [1, 2, 3])
+def test_batch_trajectories_never_exceed_fuel(gear):
+    rng = np.random.default_rng(gear)
+    grids = np.stack([random_grid(rng, (30, 40), density) for density in [0.0, 0.01, 0.1, 0.5]])
+    starts = rng.integers(0, 30, size=(len(grids), 2))
+    result = BatchForagerSimulation(grids, starts, gear, seeds=np.arange(len(grids)), record=True).run()
+    for b, trajectory in enumerate(result.trajectories):
+        assert len(trajectory) == result.tiles_visited[b] <= max(MAX_MOVEMENT(gear), 1)
+        assert np.array_equal(trajectory[0], starts[b])
+        assert np.array_equal(trajectory[-1], result.final_positions[b])
+        # At most one tile per move (a move along an aligned axis stays put)
+        assert np.all(np.abs(np.diff(trajectory.astype(np.int64), axis=0)).sum(axis=1) <= 1)
+
+
+def test_batch_from_world_paths_gives_each_bot_its_map(tmp_path):
+    static = Path(__file__).parent / "static"
+    binary_path = convert_json_map(static / "map1.json", tmp_path / "map1.cmap")
+    paths = [static / "map0.json", static / "map1.json", static / "map0.json", binary_path]
+    starts = [(65, 22), (20, 20), (10, 70), (40, 40)]
+    simulation = BatchForagerSimulation.from_world_paths(paths, starts, 2, seeds=[1, 2, 3, 4])
+    grids = np.stack([MAPS.get(path).grid() for path in paths])
+    assert np.array_equal(simulation.grids, grids)
+    assert np.array_equal(simulation.grids[1], simulation.grids[3])
+    expected = BatchForagerSimulation(grids, starts, 2, seeds=[1, 2, 3, 4]).run()
+    assert np.array_equal(simulation.run().coins_collected, expected.coins_collected)
+
+
+# ---------------------------------------------------------------------------
+# Schedules
+# ---------------------------------------------------------------------------
+@pytest.mark.parametrize("positions", [[(10, 10), (12, 10)], [(12, 10), (10, 10)], [(11, 11), (11, 9)]])
+def test_lockstep_coin_reached_together_goes_to_the_first_forager(positions):
+    # In gear 1 every coin entered is collected, and both reach (11, 10) on the first move
+    world = World.generate_from_array([(11, 10)])
+    coins_collected, tiles_visited = world.reward_from_bots(positions, 1, rng=np.random.default_rng(0), schedule="lockstep")
+    assert coins_collected == [1, 0]
+    assert [tuple(visited[-1]) for visited in tiles_visited] == [(11, 10), (11, 10)]
+
+
+@pytest.mark.parametrize("schedule", ["sequential", "lockstep"])
+@pytest.mark.parametrize("record", ["full", "collected", "none"])
+def test_reward_from_bots_returns_coins_and_visits_per_forager(schedule, record):
+    world = World.generate_from_json(MAP_PATH)
+    positions = [(65, 22), (56, 28), (10, 70)]
+    coins_collected, tiles_visited = world.reward_from_bots(
+        positions, 2, rng=np.random.default_rng(1), record=record, schedule=schedule,
+    )
+    assert len(coins_collected) == len(tiles_visited) == len(positions)
+    assert all(isinstance(n, int) for n in coins_collected)
+    assert sum(coins_collected) <= len(world.coins())
+    for start, visited in zip(positions, tiles_visited):
+        assert visited.ndim == 2 and visited.shape[1] == 2
+        if record == "full":
+            assert tuple(visited[0].tolist()) == start
+            assert 1 <= len(visited) <= MAX_MOVEMENT(2)
+        else:
+            # Only full records keep the tiles visited
+            assert len(visited) == 0
+
+
+
+
+# ---------------------------------------------------------------------------
+# Coordinator views
+# ---------------------------------------------------------------------------
+@pytest.mark.parametrize("investment", [0.0, 0.5, 1.0])
+def test_coordinator_view_mixes_true_coins_and_noise_by_investment(investment):
+    world = World.generate_from_json(MAP_PATH)
+    n_coins, n_cells = len(world.coins()), world.grid.size
+    p = World.get_probability_of_view(
+        investment, world.threshold, world.steepness, world.min_value, world.proportion,
+    )
+    n_views = 200
+    shown, on_coins = np.zeros(n_views), np.zeros(n_views)
+    for seed in range(n_views):
+        world._rng = np.random.default_rng(seed)
+        view = world.coordinator_view(investment)
+        assert view.dtype == np.uint8 and view.shape == world.grid.shape
+        assert set(np.unique(view).tolist()) <= {140, 255}
+        shown[seed] = (view == 255).sum()
+        on_coins[seed] = (view == 255)[world.grid].sum()
+    # As many candidates as coins are drawn, and each is shown with probability p
+    assert abs(shown.mean() - p * n_coins) < 4 * np.sqrt(p * (1 - p) * n_coins / n_views) + 0.5
+    # Candidates are the coins plus noise on each cell with probability 1 - investment,
+    # so a candidate is on a coin cell with probability (n + n (1 - i)) / (n + N (1 - i))
+    on_coin = n_coins * (2 - investment) / (n_coins + n_cells * (1 - investment))
+    fraction = on_coins.sum() / shown.sum()
+    assert abs(fraction - on_coin) < 4 * np.sqrt(on_coin * (1 - on_coin) / shown.sum()) + 1e-9
+
+
+# ---------------------------------------------------------------------------
+# Coin clusters
+# ---------------------------------------------------------------------------
+@pytest.mark.parametrize("covs", ["shared", "per_cluster", "matrices"])
+def test_sample_clusters_counts_and_covariances(covs):
+    world = World.empty(rng=np.random.default_rng(0))
+    means = np.array([[10.0, 20.0], [50.0, 40.0], [70.0, 5.0]])
+    counts = [4000, 0, 6000]
+    covariances = {
+        "shared": 4.0,
+        "per_cluster": [1.0, 2.0, 9.0],
+        "matrices": np.array([[[4.0, 1.0], [1.0, 2.0]], [[1.0, 0.0], [0.0, 1.0]], [[9.0, -3.0], [-3.0, 5.0]]]),
+    }[covs]
+    expected = np.asarray(covariances, dtype=float)
+    if expected.ndim < 2:
+        expected = np.broadcast_to(expected, (3,))[:, None, None] * np.eye(2)
+
+    samples = world.sample_clusters(means, covariances, counts)
+    assert samples.shape == (sum(counts), 2)
+    for cluster, mean, cov in zip(np.split(samples, np.cumsum(counts)[:-1]), means, expected):
+        if len(cluster) == 0:
+            continue
+        assert np.all(np.abs(cluster.mean(axis=0) - mean) < 5 * np.sqrt(np.diag(cov) / len(cluster)))
+        assert np.allclose(np.cov(cluster.T), cov, atol=5 * np.sqrt(2 / len(cluster)) * np.diag(cov).max())
+
+
+def test_sample_clusters_checks_one_count_per_cluster():
+    world = World.empty(rng=np.random.default_rng(0))
+    with pytest.raises(AssertionError):
+        world.sample_clusters([[1.0, 2.0], [3.0, 4.0]], 1.0, [1, 2, 3])
+    with pytest.raises(AssertionError):
+        world.sample_clusters([[1.0, 2.0]], 1.0, [-1])
+
+
+# ---------------------------------------------------------------------------
+# Placement
+# ---------------------------------------------------------------------------
+def test_first_forager_goes_where_it_sees_the_most_coins():
+    rng = np.random.default_rng(5)
+    ys, xs = np.nonzero(random_grid(rng, (World.height, World.width), 0.03))
+    world = World.generate_from_array(np.stack([xs, ys], axis=1))
+    (x, y), = place_foragers(world, 1).position_list()
+    ys, xs = np.mgrid[0:World.height, 0:World.width]
+    seen = brute_force_counts(world.grid, xs, ys, VIEW_RADIUS, "square")
+    assert seen[y, x] == seen.max()
+
+
+@pytest.mark.parametrize("n_coins", [0, 1, 3])
+def test_foragers_never_share_a_cell_once_every_coin_is_covered(n_coins):
+    world = World.generate_from_array([(10 + 20 * i, 10) for i in range(n_coins)])
+    placement = place_foragers(world, 6, fixed=[(0, 0)])
+    positions = placement.position_list()
+    assert len(set(positions)) == 6
+    assert (0, 0) not in positions
+    assert placement.covered == n_coins
+
+
+def test_fixed_foragers_cover_their_coins_first():
+    left = [(10 + dx, 40 + dy) for dx in range(3) for dy in range(3)]
+    right = [(60 + dx, 40 + dy) for dx in range(2) for dy in range(2)]
+    world = World.generate_from_array(left + right)
+    assert place_foragers(world, 1).position_list()[0][0] < 20
+    assert place_foragers(world, 1, fixed=[(11, 41)]).position_list()[0][0] > 50
+
+
+def test_placement_cache_is_keyed_by_the_fixed_foragers():
+    map_path = Path(__file__).parent / "static" / "map0.json"
+    world = World.generate_from_json(map_path)
+    cache = PlacementCache()
+    alone = cache.get(map_path, 1)
+    beside = cache.get(map_path, 1, fixed=alone.position_list())
+    assert beside.position_list() != alone.position_list()
+    assert beside.position_list() == place_foragers(world, 1, fixed=alone.position_list()).position_list()
+    assert cache.get(map_path, 1, fixed=np.array(alone.positions)) is beside
+    assert len(cache) == 2
+
+
+# ---------------------------------------------------------------------------
+# Grid encoding
+# ---------------------------------------------------------------------------
+def js_function(source: str, name: str) -> str:
+    """Source of `function name(...) {...}` in source, by matching braces."""
+    start = source.index(f"function {name}(")
+    depth = 0
+    for i in range(source.index("{", start), len(source)):
+        depth += {"{": 1, "}": -1}.get(source[i], 0)
+        if depth == 0:
+            return source[start:i + 1]
+    raise ValueError(f"Unbalanced braces in {name}")
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node is not installed")
+@pytest.mark.parametrize("seed", [0, 1, 123456789, 2 ** 32 - 1])
+def test_terrain_decoded_in_browser_matches_python(seed):
+    with open(Path(__file__).parent / "templates" / "foraging-control.html", "r") as f:
+        template = f.read()
+    rng = np.random.default_rng(seed % 1000)
+    grid = random_grid(rng, (17, 23), 0.1)
+    payload = encode_terrain(grid, seed)
+    script = "\n".join(js_function(template, name) for name in ["lowbias32", "terrainNoise", "decodeGrid"])
+    script += f"\nconst grid = decodeGrid({json.dumps(payload)});"
+    script += "\nconsole.log(JSON.stringify(grid.map(row => Array.from(row))));"
+    output = subprocess.run(["node", "-e", script], capture_output=True, text=True, check=True).stdout
+    expected = decode_grid(payload)
+    assert np.array_equal(np.array(json.loads(output)), expected)
+    assert np.array_equal(expected[grid == 0], terrain_noise(seed, *grid.shape)[grid == 0])
+    assert np.all(expected[grid == 1] == 0)
+
+
+# ---------------------------------------------------------------------------
+# Maps
+# ---------------------------------------------------------------------------
+def test_registry_parses_a_map_again_once_its_content_changes(tmp_path):
+    path = tmp_path / "map.json"
+    with open(path, "w") as f:
+        json.dump([[1, 2], [3, 4]], f)
+    registry = MapRegistry()
+    first = registry.get(path)
+    assert registry.get(path) is first
+
+    with open(path, "w") as f:
+        json.dump([[5, 6], [7, 8], [9, 10]], f)
+    second = registry.get(path)
+    assert second.digest != first.digest
+    assert second.coins.tolist() == [[5, 6], [7, 8], [9, 10]]
+    # Only the latest version of the file is kept
+    assert len(registry) == 1
+
+    # A new stat with the same content is hashed again, but not parsed again
+    os.utime(path, ns=(0, 0))
+    assert registry.get(path) is second
+
+
+def test_binary_map_round_trip(tmp_path):
+    rng = np.random.default_rng(0)
+    coins = rng.integers(0, 80, size=(200, 2))
+    json_path = tmp_path / "map.json"
+    with open(json_path, "w") as f:
+        json.dump(coins.tolist(), f)
+
+    binary_path = convert_json_map(json_path)
+    read, width, height = read_binary_map(binary_path)
+    assert np.array_equal(read, coins)
+
+    registry = MapRegistry()
+    from_json, from_binary = registry.get(json_path), registry.get(binary_path)
+    assert np.array_equal(from_json.coins, from_binary.coins)
+    assert np.array_equal(from_json.grid(), from_binary.grid())
+    assert from_binary.shape == (height, width)
+
+
+def test_empty_binary_map_and_bad_header(tmp_path):
+    path = tmp_path / "empty.cmap"
+    write_binary_map(path, np.zeros((0, 2)), width=5, height=3)
+    coins, width, height = read_binary_map(path)
+    assert coins.shape == (0, 2) and (width, height) == (5, 3)
+
+    with open(path, "r+b") as f:
+        f.write(b"XXXX")
+    with pytest.raises(ValueError):
+        read_binary_map(path)
+
+
+# ---------------------------------------------------------------------------
+# Rewards
+# ---------------------------------------------------------------------------
+def scalar_rewards(coins, overhead, wages, investment):
+    """The per-allocation arithmetic batch_rewards replaced."""
+    n_foragers = len(coins)
+    n_coins = sum(coins)
+    endowment = COORDINATOR_INITIAL_ENDOWMENT
+    coordinator = int(overhead * n_coins + int(endowment - investment * endowment))
+    remaining = n_coins - int(overhead * n_coins)
+    for_salaries = int(remaining * wages)
+    if for_salaries < n_foragers:
+        for_salaries = 0
+    salary = int(for_salaries / n_foragers)
+    if n_coins == 0:
+        proportions = np.zeros(n_foragers)
+    else:
+        proportions = np.array(coins) / n_coins
+    commissions = [int(commission) for commission in proportions * (remaining - for_salaries)]
+    return coordinator, [salary + commission for commission in commissions]
+
+
+@pytest.mark.parametrize("n_foragers", [1, 2, 5])
+def test_batch_rewards_match_scalar_rules(n_foragers):
+    rng = np.random.default_rng(n_foragers)
+    n_trials = 2000
+    coins = rng.integers(0, rng.choice([3, 50, 500], size=(n_trials, 1)), size=(n_trials, n_foragers))
+    overhead = rng.choice([0.05, 0.5, 0.95, 0.3], size=n_trials)
+    wages = rng.choice([0.0, 0.3, 0.77], size=n_trials)
+    investment = rng.choice([0.0, 0.1, 0.5, 1.0, 0.33], size=n_trials)
+
+    breakdown = batch_rewards(coins, overhead, wages, investment)
+    for i in range(n_trials):
+        coordinator, foragers = scalar_rewards(coins[i].tolist(), overhead[i], wages[i], investment[i])
+        assert breakdown.coordinator[i] == coordinator
+        assert breakdown.foragers[i].tolist() == foragers
+
+        tracker = WealthTracker(coins[i].tolist())
+        tracker.initialize({"overhead": float(overhead[i]), "wages": float(wages[i])}, float(investment[i]))
+        assert tracker.get_coordinator_reward() == coordinator
+        assert tracker.foragers_rewards == foragers
+
+
+def test_batch_rewards_broadcast_for_sweeps():
+    coins = np.array([[3, 4], [10, 0], [0, 0]])
+    overheads = np.array([0.05, 0.5, 0.95])
+    breakdown = batch_rewards(coins[None], overheads[:, None], 0.2, 0.5)
+    assert breakdown.foragers.shape == (3, 3, 2)
+    assert breakdown.coordinator.shape == (3, 3)
+    for i, overhead in enumerate(overheads):
+        single = batch_rewards(coins, overhead, 0.2, 0.5)
+        assert np.array_equal(breakdown.foragers[i], single.foragers)
+
+
+def test_expected_reward_does_not_depend_on_the_workers():
+    world = World.generate_from_json(Path(__file__).parent / "static" / "map0.json")
+    positions = [(65, 22), (56, 28)]
+    estimates = [
+        world.expected_reward_from_bots(positions, 2, n_samples=12, workers=workers, seed=7)
+        for workers in (1, 2, 5)
+    ]
+    # One stream per sample, spawned from the seed
+    samples = np.array([
+        world.reward_from_bots(positions, 2, rng=np.random.default_rng(stream), record="none")[0]
+        for stream in np.random.SeedSequence(7).spawn(12)
+    ])
+    for estimate in estimates:
+        assert np.array_equal(estimate.mean, samples.mean(axis=0))
+        assert np.allclose(estimate.variance, samples.var(axis=0, ddof=1))
+        assert np.all((estimate.ci_low <= estimate.mean) & (estimate.mean <= estimate.ci_high))
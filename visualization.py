@@ -0,0 +1,168 @@
+# Module with the rendering of worlds (thumbnails, minimaps, plots)
+#
+# Kept apart from helper_classes so that the simulation core imports without
+# any plotting library: PIL and matplotlib are only imported on first use.
+import sys
+import zlib
+import struct
+import numpy as np
+
+from pathlib import Path
+from functools import lru_cache
+from numpy.typing import NDArray
+from typing import Tuple, List, Iterable, Optional, Union, Any
+
+try:
+    # Assume running from psynet
+    from .map_registry import MAPS
+    from .game_parameters import ASSETS_PATHS
+except:
+    # If not, try normal import
+    from map_registry import MAPS
+    from game_parameters import ASSETS_PATHS
+
+Pos = Tuple[int, int]  # (x, y)
+Color = Tuple[int, int, int, int]  # RGBA
+
+BACKGROUND: Color = (255, 255, 255, 255)
+
+
+@lru_cache(maxsize=32)
+def load_sprite(path: Union[str, Path], size: int) -> NDArray[np.float32]:
+    """
+    Sprite at path resized to size x size pixels, as premultiplied RGBA floats in [0, 1].
+    Decoded once per (path, size); PIL is only needed here.
+    """
+    from PIL import Image
+
+    with Image.open(path) as image:
+        image = image.convert("RGBA").resize((size, size), Image.LANCZOS)
+        sprite = np.asarray(image, dtype=np.float32) / 255
+    sprite[..., :3] *= sprite[..., 3:]
+    sprite.flags.writeable = False
+    return sprite
+
+
+def blit(canvas: NDArray[np.uint8], ys: NDArray, xs: NDArray, sprite: NDArray[np.float32], cell_size: int) -> None:
+    """
+    Alpha-blend sprite (premultiplied, see load_sprite) in place onto the cells
+    (xs, ys) of canvas, centred in each cell. Cost is one vectorized blend over
+    all the cells, independent of the canvas size.
+    """
+    height, width = canvas.shape[0] // cell_size, canvas.shape[1] // cell_size
+    size = sprite.shape[0]
+    offset = (cell_size - size) // 2
+    # (H, W, cell, cell, 4) view of the canvas, one block per cell
+    blocks = canvas.reshape(height, cell_size, width, cell_size, 4).swapaxes(1, 2)
+    window = (ys, xs, slice(offset, offset + size), slice(offset, offset + size))
+    below = blocks[window].astype(np.float32) / 255
+    alpha = sprite[..., 3:]
+    blended = sprite + below * (1 - alpha)
+    blocks[window] = np.rint(blended * 255).astype(np.uint8)
+
+
+def render_grid(
+    grid: NDArray,
+    cell_size: int = 8,
+    coin_zoom: float = 0.8,
+    coin_path: Union[str, Path] = ASSETS_PATHS["coin_url"],
+    background: Color = BACKGROUND,
+    mask: Optional[NDArray[np.bool_]] = None,
+) -> NDArray[np.uint8]:
+    """
+    RGBA image of a 0/1 coin grid, shape (H * cell_size, W * cell_size, 4).
+
+    Args:
+        :param cell_size: Side of a cell in pixels.
+        :param coin_zoom: Relative size of the coin inside a cell (0<zoom<=1).
+        :param mask: Optional boolean grid; only coins where it is True are drawn.
+    """
+    if grid.ndim != 2:
+        raise ValueError("grid must be 2D")
+    if not (0 < coin_zoom <= 1.0):
+        raise ValueError("coin_zoom must be in (0, 1].")
+    height, width = grid.shape
+    canvas = np.empty((height * cell_size, width * cell_size, 4), dtype=np.uint8)
+    canvas[:] = background
+
+    coins = grid == 1
+    if mask is not None:
+        coins &= mask
+    ys, xs = np.nonzero(coins)
+    if ys.size > 0:
+        sprite = load_sprite(coin_path, max(1, round(cell_size * coin_zoom)))
+        blit(canvas, ys, xs, sprite, cell_size)
+    return canvas
+
+
+def _png_chunk(kind: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+
+
+def encode_png(image: NDArray[np.uint8], level: int = 6) -> bytes:
+    """PNG bytes of an (H, W, 4) RGBA or (H, W, 3) RGB uint8 image."""
+    if image.dtype != np.uint8 or image.ndim != 3 or image.shape[2] not in (3, 4):
+        raise ValueError("image must be an (H, W, 3) or (H, W, 4) uint8 array")
+    height, width, channels = image.shape
+    color_type = 6 if channels == 4 else 2
+    # Each row starts with filter type 0 (None)
+    rows = np.zeros((height, 1 + width * channels), dtype=np.uint8)
+    rows[:, 1:] = image.reshape(height, -1)
+    header = struct.pack(">IIBBBBB", width, height, 8, color_type, 0, 0, 0)
+    return b"".join([
+        b"\x89PNG\r\n\x1a\n",
+        _png_chunk(b"IHDR", header),
+        _png_chunk(b"IDAT", zlib.compress(rows.tobytes(), level)),
+        _png_chunk(b"IEND", b""),
+    ])
+
+
+def show_bots(
+    world: Any,
+    locations: List[Pos],
+    max_distance: Optional[float] = 15.0,
+    ax: Optional["matplotlib.axes.Axes"] = None,
+) -> "matplotlib.axes.Axes":
+    """Plot the terrain of world with a red circle of radius max_distance around each bot location."""
+    import matplotlib.pyplot as plt
+    from matplotlib.patches import Circle
+
+    if ax is None:
+        fig, ax = plt.subplots(
+            figsize=(8, 5),
+            dpi=100
+        )
+    img = world.generate_terrain()
+    ax.imshow(img)
+    for location in locations:
+        x, y = location
+        r = max_distance
+        c = Circle(
+            (x, y), r,
+            facecolor = "none",  # no fill
+            edgecolor = "red",  # red perimeter
+            linewidth = 4,  # thick outline (adjust as needed)
+        )
+        ax.add_patch(c)
+    ax.axis('off')
+    return ax
+
+
+def render_maps(
+    map_paths: Iterable[Union[str, Path]],
+    out_dir: Union[str, Path],
+    cell_size: int = 2,
+    coin_zoom: float = 1.0,
+) -> None:
+    """Save a PNG thumbnail (e.g. a minimap) next to each map name in out_dir."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for map_path in map_paths:
+        image = render_grid(MAPS.get(map_path).grid(), cell_size=cell_size, coin_zoom=coin_zoom)
+        with open(out_dir / f"{Path(map_path).stem}.png", "wb") as f:
+            f.write(encode_png(image))
+
+
+if __name__ == "__main__":
+    # python visualization.py OUT_DIR static/map*.json
+    render_maps(sys.argv[2:], sys.argv[1])